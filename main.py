@@ -4,6 +4,7 @@ Bone Segmentation 3D - Medical Imaging Application
 
 Entry point for the application.
 """
+import logging
 import sys
 import os
 
@@ -16,6 +17,8 @@ from bone_segmentation.ui.main_window_init import MainWindow
 
 def main():
     """Main entry point for the application."""
+    # Progress messages are logged at DEBUG; run with level=logging.DEBUG to see them
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     app = QApplication(sys.argv)
     mainWin = MainWindow()
     mainWin.show()
@@ -37,9 +37,11 @@ def main():
     os.chdir(project_root)
     
     # Import and run
+    import logging
     from bone_segmentation.ui.main_window_init import MainWindow
     from PyQt5.QtWidgets import QApplication
     
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
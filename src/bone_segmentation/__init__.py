@@ -13,25 +13,15 @@ Author: Dawit
 License: MIT
 """
 
+from bone_segmentation import _lazy
+
 __version__ = "1.0.0"
 __author__ = "Dawit"
 __email__ = "your.email@example.com"
 
-from bone_segmentation.core.image_processing import (
-    load_image,
-    load_image_series,
-    get_slice,
-    apply_threshold,
-    adjust_contrast,
-    apply_windowing,
-    apply_gaussian_filter,
-    apply_median_filter,
-    create_qimage_from_slice,
-)
-
-__all__ = [
+__all__ = (
     "load_image",
-    "load_image_series", 
+    "load_image_series",
     "get_slice",
     "apply_threshold",
     "adjust_contrast",
@@ -40,4 +30,12 @@ __all__ = [
     "apply_median_filter",
     "create_qimage_from_slice",
     "__version__",
-]
+)
+
+# Re-exported names are resolved on first access (PEP 562) so that importing
+# the package does not pull in SimpleITK, SciPy and Qt up front.
+_LAZY_IMPORTS = {
+    name: "bone_segmentation.core.image_processing" for name in __all__ if name != "__version__"
+}
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
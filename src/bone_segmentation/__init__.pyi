@@ -0,0 +1,29 @@
+# Static view of the lazily re-exported names in __init__.py
+from bone_segmentation.core.image_processing import (
+    load_image as load_image,
+    load_image_series as load_image_series,
+    get_slice as get_slice,
+    apply_threshold as apply_threshold,
+    adjust_contrast as adjust_contrast,
+    apply_windowing as apply_windowing,
+    apply_gaussian_filter as apply_gaussian_filter,
+    apply_median_filter as apply_median_filter,
+    create_qimage_from_slice as create_qimage_from_slice,
+)
+
+__version__: str
+__author__: str
+__email__: str
+
+__all__ = (
+    "load_image",
+    "load_image_series",
+    "get_slice",
+    "apply_threshold",
+    "adjust_contrast",
+    "apply_windowing",
+    "apply_gaussian_filter",
+    "apply_median_filter",
+    "create_qimage_from_slice",
+    "__version__",
+)
@@ -0,0 +1,23 @@
+# _lazy.py
+# PEP 562 hooks shared by the package __init__ modules. Re-exported names are
+# imported from their defining module on first access and then cached on the
+# package, so importing a package stays cheap.
+import importlib
+import sys
+
+
+def attach(module_name, lazy_imports):
+    """Return (__getattr__, __dir__) for module_name; lazy_imports maps each name to its module."""
+
+    def __getattr__(name):
+        source = lazy_imports.get(name)
+        if source is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(source), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(lazy_imports))
+
+    return __getattr__, __dir__
@@ -5,26 +5,21 @@ This module provides functions for loading, processing, and transforming
 medical images from DICOM and other formats.
 """
 
-from bone_segmentation.core.image_processing import (
-    load_image,
-    load_image_series,
-    get_slice,
-    apply_threshold,
-    adjust_contrast,
-    apply_windowing,
-    apply_gaussian_filter,
-    apply_median_filter,
-    create_qimage_from_slice,
-)
+from bone_segmentation import _lazy
 
-__all__ = [
+__all__ = (
     "load_image",
     "load_image_series",
-    "get_slice", 
+    "get_slice",
     "apply_threshold",
     "adjust_contrast",
     "apply_windowing",
     "apply_gaussian_filter",
     "apply_median_filter",
     "create_qimage_from_slice",
-]
+)
+
+# Resolved on first access (PEP 562) so importing the package stays cheap
+_LAZY_IMPORTS = {name: "bone_segmentation.core.image_processing" for name in __all__}
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,48 @@
+# _surface.py
+# Optional VTK isosurface extraction for image_processing.extract_isosurface.
+# vtkFlyingEdges3D visits each voxel edge once and is several times faster
+# than skimage's marching cubes on the same grid. Without VTK, HAVE_VTK is
+# False and image_processing falls back to skimage.
+import numpy as np
+
+try:
+    import vtk
+    from vtk.util import numpy_support
+    HAVE_VTK = True
+except ImportError:
+    HAVE_VTK = False
+
+
+def flying_edges(volume, level):
+    """Return (vertices, faces, normals) for the level surface of a (z, y, x) volume.
+
+    Vertices and normals come back in (z, y, x) order with the same triangle
+    winding as skimage.measure.marching_cubes. The arrays are copies, so they
+    stay valid after the VTK pipeline is released.
+    """
+    volume = np.ascontiguousarray(volume)
+    depth, height, width = volume.shape
+
+    image = vtk.vtkImageData()
+    image.SetDimensions(width, height, depth)  # VTK indexes x fastest, like a C-order (z, y, x) array
+    image.GetPointData().SetScalars(numpy_support.numpy_to_vtk(volume.ravel(), deep=False))
+
+    contour = vtk.vtkFlyingEdges3D()
+    contour.SetInputData(image)
+    contour.SetValue(0, level)
+    contour.ComputeNormalsOn()
+    contour.ComputeScalarsOff()
+    contour.Update()
+    output = contour.GetOutput()
+
+    if output.GetNumberOfPoints() == 0:
+        raise ValueError(f"No surface found at level {level}")
+
+    # Back to (z, y, x). Mirroring the axes flips VTK's outward winding, which is exactly
+    # skimage's convention (triangles wound against the gradient normals), so faces stay as-is
+    points = numpy_support.vtk_to_numpy(output.GetPoints().GetData())
+    vertices = np.ascontiguousarray(points[:, ::-1], dtype=np.float32)
+    normals = np.ascontiguousarray(numpy_support.vtk_to_numpy(output.GetPointData().GetNormals())[:, ::-1])
+    connectivity = numpy_support.vtk_to_numpy(output.GetPolys().GetConnectivityArray())
+    faces = connectivity.reshape(-1, 3).astype(np.int32)
+    return vertices, faces, normals
@@ -1,13 +1,42 @@
 # image_processing.py
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import SimpleITK as sitk
-from PyQt5.QtGui import QImage, qRgb
+from PyQt5.QtGui import QImage
 import numpy as np
 import scipy.ndimage as ndimage
+from skimage import measure
+
+from bone_segmentation.core import _fast, _surface
+
+logger = logging.getLogger(__name__)
+
+
+# Loaded volumes are cached per path and modification time, so re-opening an
+# unchanged file or series skips the DICOM/NIfTI parse. Only the most recent
+# one is kept because a single CT volume can take hundreds of MB.
+@lru_cache(maxsize=1)
+def _read_image_cached(path, mtime):
+    return sitk.ReadImage(path)
+
+
+@lru_cache(maxsize=1)
+def _read_series_cached(folder, file_stamps):
+    reader = sitk.ImageSeriesReader()
+    reader.SetFileNames([name for name, _ in file_stamps])
+    return reader.Execute()
 
 
 def load_image(filename):
     try:
-        image = sitk.ReadImage(filename)
+        path = os.path.abspath(filename)
+        image = _read_image_cached(path, os.path.getmtime(path))
         return image
     except Exception as e:
         print(f"Failed to load image: {str(e)}")
@@ -16,26 +45,126 @@ def load_image(filename):
 
 def load_image_series(folder):
     try:
-        reader = sitk.ImageSeriesReader()
-        dicom_names = reader.GetGDCMSeriesFileNames(folder)
-        reader.SetFileNames(dicom_names)
-        image = reader.Execute()
+        folder = os.path.abspath(folder)
+        dicom_names = sitk.ImageSeriesReader.GetGDCMSeriesFileNames(folder)
+        file_stamps = tuple((name, os.path.getmtime(name)) for name in dicom_names)
+        image = _read_series_cached(folder, file_stamps)
         return image
     except Exception as e:
         print(f"Failed to load image series: {str(e)}")
         return None
 
 
-def get_slice(image, index, orientation='axial'):
+# Window presets are read from the DICOM header only, once per file and modification time
+@lru_cache(maxsize=32)
+def _read_window_presets_cached(path, mtime):
+    reader = sitk.ImageFileReader()
+    reader.SetFileName(path)
+    reader.ReadImageInformation()
+    if not (reader.HasMetaDataKey('0028|1050') and reader.HasMetaDataKey('0028|1051')):
+        return ()
+
+    # Window Center, Window Width and Window Center & Width Explanation are multi-valued, split on '\'
+    centers = reader.GetMetaData('0028|1050').split('\\')
+    widths = reader.GetMetaData('0028|1051').split('\\')
+    names = reader.GetMetaData('0028|1055').split('\\') if reader.HasMetaDataKey('0028|1055') else []
+    presets = []
+    for i, (center, width) in enumerate(zip(centers, widths)):
+        name = names[i].strip() if i < len(names) and names[i].strip() else f"DICOM {i + 1}"
+        presets.append((name, int(round(float(center))), max(1, int(round(float(width))))))
+    return tuple(presets)
+
+
+def read_window_presets(filename):
+    """Return the window presets in a DICOM file's header as ((name, center, width), ...).
+
+    Files without window tags, such as NIfTI volumes, give an empty tuple.
+    """
+    try:
+        path = os.path.abspath(filename)
+        return _read_window_presets_cached(path, os.path.getmtime(path))
+    except Exception as e:
+        print(f"Failed to read window presets: {str(e)}")
+        return ()
+
+
+load_image.cache_clear = _read_image_cached.cache_clear
+load_image_series.cache_clear = _read_series_cached.cache_clear
+
+
+# Recently extracted slices, keyed by (id(image), orientation, index). Each entry
+# also holds a weak reference to the image, so a recycled id() can never return a
+# stale slice and the cache does not keep a replaced volume alive.
+_SLICE_CACHE_SIZE = 32
+_PREFETCH_OFFSETS = (1, -1, 2, -2)
+_SIZE_AXIS = {'axial': 2, 'coronal': 1, 'sagittal': 0}
+_slice_cache = OrderedDict()
+_slice_cache_lock = threading.Lock()
+_prefetch_pool = None
+
+
+def _extract_slice(image, index, orientation):
+    # Zero-copy view of the volume; only the requested 2D plane is copied out
+    array = sitk.GetArrayViewFromImage(image)
+    if orientation == 'axial':
+        slice = array[index, :, :]
+    elif orientation == 'coronal':
+        slice = array[:, index, :]
+    elif orientation == 'sagittal':
+        slice = array[:, :, index]
+    slice = np.array(slice)
+    slice.setflags(write=False)  # shared through the cache; get_slice hands out copies
+    return slice
+
+
+def _cached_slice(image, index, orientation):
+    key = (id(image), orientation, index)
+    with _slice_cache_lock:
+        entry = _slice_cache.get(key)
+        if entry is not None and entry[0]() is image:
+            _slice_cache.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def _store_slice(image, index, orientation, slice):
+    with _slice_cache_lock:
+        _slice_cache[(id(image), orientation, index)] = (weakref.ref(image), slice)
+        while len(_slice_cache) > _SLICE_CACHE_SIZE:
+            _slice_cache.popitem(last=False)
+
+
+def _prefetch_slice(image, index, orientation):
     try:
-        array = sitk.GetArrayFromImage(image)
-        if orientation == 'axial':
-            slice = array[index, :, :]
-        elif orientation == 'coronal':
-            slice = array[:, index, :]
-        elif orientation == 'sagittal':
-            slice = array[:, :, index]
-        return slice
+        if _cached_slice(image, index, orientation) is None:
+            _store_slice(image, index, orientation, _extract_slice(image, index, orientation))
+    except Exception as e:
+        logger.debug("Failed to prefetch slice: %s", e)
+
+
+def _schedule_prefetch(image, index, orientation):
+    global _prefetch_pool
+    if _prefetch_pool is None:
+        _prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slice-prefetch')
+
+    limit = image.GetSize()[_SIZE_AXIS[orientation]]
+    for offset in _PREFETCH_OFFSETS:
+        neighbor = index + offset
+        if 0 <= neighbor < limit and _cached_slice(image, neighbor, orientation) is None:
+            _prefetch_pool.submit(_prefetch_slice, image, neighbor, orientation)
+
+
+def get_slice(image, index, orientation='axial', prefetch=False):
+    """Return a 2D slice; with prefetch=True the neighbouring slices are warmed in the background."""
+    try:
+        slice = _cached_slice(image, index, orientation)
+        if slice is None:
+            slice = _extract_slice(image, index, orientation)
+            _store_slice(image, index, orientation, slice)
+
+        if prefetch:
+            _schedule_prefetch(image, index, orientation)
+        return slice.copy()
     except Exception as e:
         print(f"Failed to get slice: {str(e)}")
         return None
@@ -52,9 +181,12 @@ def normalize_slice_safe(slice_data):
             # Return a uniform array with middle gray value
             return np.full(slice_data.shape, 128, dtype=np.uint8)
 
-        # Normal normalization
-        slice_normalized = ((slice_data - slice_min) / (slice_max - slice_min) * 255).astype(np.uint8)
-        return slice_normalized
+        # Normal normalization, in one float buffer (float64 for integers so they cannot overflow)
+        work_dtype = slice_data.dtype if slice_data.dtype.kind == 'f' else np.float64
+        scaled = np.subtract(slice_data, slice_min, dtype=work_dtype)
+        np.divide(scaled, slice_max - slice_min, out=scaled)
+        np.multiply(scaled, 255, out=scaled)
+        return scaled.astype(np.uint8)
 
     except Exception as e:
         print(f"Warning: Error in slice normalization: {e}")
@@ -62,16 +194,27 @@ def normalize_slice_safe(slice_data):
         return np.clip(slice_data, 0, 255).astype(np.uint8)
 
 
-def create_qimage_from_slice(slice, target_size=(400, 400)):
+def create_qimage_from_slice(slice, target_size=(400, 400), out=None):
+    """Return a grayscale QImage of the slice.
+
+    If out is a Grayscale8 QImage of the same size its buffer is reused,
+    so repeated calls for one view do not allocate a new image.
+    """
     try:
         height, width = slice.shape
-        bytes_per_line = width
         slice_normalized = normalize_slice_safe(slice)
-        qimage = QImage(slice_normalized.data, width, height, bytes_per_line, QImage.Format_Indexed8)
 
-        # Set color table (grayscale)
-        gray_color_table = [qRgb(i, i, i) for i in range(256)]
-        qimage.setColorTable(gray_color_table)
+        if (out is not None and out.width() == width and out.height() == height
+                and out.format() == QImage.Format_Grayscale8):
+            qimage = out
+        else:
+            qimage = QImage(width, height, QImage.Format_Grayscale8)
+
+        # Copy rows into the image buffer, honouring its 4-byte aligned stride
+        ptr = qimage.bits()
+        ptr.setsize(qimage.sizeInBytes())
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(height, qimage.bytesPerLine())
+        rows[:, :width] = slice_normalized
 
         return qimage
     except Exception as e:
@@ -79,8 +222,14 @@ def create_qimage_from_slice(slice, target_size=(400, 400)):
         return None
 
 
-def apply_threshold(slice, threshold_value):
+def apply_threshold(slice, threshold_value, inplace=False):
     try:
+        if _fast.HAVE_NUMBA and isinstance(slice, np.ndarray):
+            return _fast.threshold(slice, threshold_value)
+        if inplace:
+            # Zero the rejected voxels directly instead of building a masked product
+            slice[slice <= threshold_value] = 0
+            return slice
         thresholded_slice = (slice > threshold_value) * slice
         return thresholded_slice
     except Exception as e:
@@ -88,46 +237,73 @@ def apply_threshold(slice, threshold_value):
         return None
 
 
-def adjust_contrast(slice, contrast_value):
+def contrast_factor(contrast_value):
+    return (259 * (contrast_value + 255)) / (255 * (259 - contrast_value))
+
+
+def adjust_contrast(slice, contrast_value, inplace=False):
     try:
-        factor = (259 * (contrast_value + 255)) / (255 * (259 - contrast_value))
-        adjusted_slice = np.clip(128 + factor * (slice - 128), 0, 255)
+        factor = contrast_factor(contrast_value)
+        if _fast.HAVE_NUMBA and isinstance(slice, np.ndarray):
+            return _fast.contrast(slice, factor)
+        # One float64 work buffer (so uint8 input cannot wrap around), updated in place
+        if inplace and slice.dtype == np.float64:
+            adjusted_slice = slice
+        else:
+            adjusted_slice = np.array(slice, dtype=np.float64)
+        np.subtract(adjusted_slice, 128.0, out=adjusted_slice)
+        np.multiply(adjusted_slice, factor, out=adjusted_slice)
+        np.add(adjusted_slice, 128.0, out=adjusted_slice)
+        np.clip(adjusted_slice, 0, 255, out=adjusted_slice)
         return adjusted_slice.astype(np.uint8)
     except Exception as e:
         print(f"Failed to adjust contrast: {str(e)}")
         return None
 
 
-def apply_windowing(image, min_val, max_val):
+def apply_windowing(image, min_val, max_val, inplace=True, function='linear'):
+    """Window to [min_val, max_val] and scale to uint8.
+
+    function is the DICOM VOI LUT function: 'linear' clamps to the window,
+    'sigmoid' rolls off smoothly around its center. Float arrays are
+    transformed in place by default; pass inplace=False to leave the
+    caller's array untouched.
+    """
     try:
         if isinstance(image, sitk.Image):
+            # GetArrayFromImage already returns a private copy
             array = sitk.GetArrayFromImage(image)
+        elif inplace or image.dtype.kind != 'f':
+            # Integer input is converted to a fresh float buffer below anyway
+            array = image
         else:
             array = image.copy()
 
-        print(f"Applying windowing: min_val={min_val}, max_val={max_val}")
-        print(f"Original array range: {array.min()} to {array.max()}")
-
-        # Ensure we're working with float for precise calculations
-        array = array.astype(np.float64)
-
-        # Apply windowing: clamp values to the window range
-        windowed_array = np.clip(array, min_val, max_val)
-
-        # Scale to 0-255 range for display
-        if max_val > min_val:
-            # Normalize to 0-1 range first
-            windowed_array = (windowed_array - min_val) / (max_val - min_val)
-            # Scale to 0-255
-            windowed_array = windowed_array * 255.0
+        # Work in float32; integer input needs exactly one converted buffer
+        if array.dtype.kind != 'f':
+            array = array.astype(np.float32)
+
+        if max_val > min_val and function == 'sigmoid':
+            # 255 / (1 + exp(-4 (x - center) / width)), evaluated in place
+            center = (min_val + max_val) / 2.0
+            np.subtract(array, center, out=array)
+            np.multiply(array, -4.0 / (max_val - min_val), out=array)
+            with np.errstate(over='ignore'):  # exp -> inf far below the window, giving 0
+                np.exp(array, out=array)
+            np.add(array, 1.0, out=array)
+            np.divide(255.0, array, out=array)
+        elif max_val > min_val:
+            # Clamp, then shift and scale to 0-255 without temporaries
+            np.clip(array, min_val, max_val, out=array)
+            np.subtract(array, min_val, out=array)
+            np.multiply(array, 255.0, out=array)
+            np.divide(array, max_val - min_val, out=array)
         else:
             # If min_val == max_val, set everything to middle gray
-            windowed_array = np.full_like(windowed_array, 127.0)
+            array.fill(127.0)
 
         # Convert to uint8
-        windowed_array = np.clip(windowed_array, 0, 255).astype(np.uint8)
-
-        print(f"Windowed array range: {windowed_array.min()} to {windowed_array.max()}")
+        windowed_array = array.astype(np.uint8)
 
         if isinstance(image, sitk.Image):
             windowed_image = sitk.GetImageFromArray(windowed_array)
@@ -141,12 +317,161 @@ def apply_windowing(image, min_val, max_val):
         return image
 
 
+def warm_up_pipeline(dtype):
+    """Compile the Numba pipeline kernel for volumes of dtype ahead of the first Apply.
+
+    Does nothing without Numba. Meant to run on a worker thread right after a
+    volume is loaded, so the first processed slice does not wait for the JIT.
+    """
+    try:
+        if _fast.HAVE_NUMBA:
+            _fast.warm_up(np.dtype(dtype))
+    except Exception as e:
+        print(f"Failed to warm up the processing kernel: {str(e)}")
+
+
+@lru_cache(maxsize=8)
+def _pipeline_lut(dtype, window, threshold_value, contrast_value):
+    # Every step is per-voxel, so running the pipeline once over all values of a
+    # small integer dtype gives a table that is exact for any array of that dtype
+    index_dtype = np.dtype(f'u{dtype.itemsize}')
+    values = np.arange(1 << (8 * dtype.itemsize), dtype=index_dtype).view(dtype)
+    lut = apply_pipeline(values, window, threshold_value, contrast_value, inplace=True, use_lut=False)
+    if lut is not None:
+        lut.setflags(write=False)
+    return lut
+
+
+def apply_pipeline(array, window=None, threshold_value=None, contrast_value=None, inplace=False, use_lut=True):
+    """Apply windowing, threshold and contrast (in that order) to an array.
+
+    window is a (min_val, max_val) pair, optionally followed by the windowing
+    function ('linear' or 'sigmoid'); a step whose argument is None is
+    skipped. With Numba (and linear windowing) the steps run as one fused
+    pass. Otherwise 8/16-bit integer arrays (e.g. int16 CT) at least as large
+    as their value range go through a cached lookup table, one gather per
+    voxel; anything else chains the NumPy functions above, each working in
+    place on the buffer the previous one produced. The input is only
+    modified when inplace=True.
+    """
+    try:
+        factor = contrast_factor(contrast_value) if contrast_value is not None else None
+        function = window[2] if window is not None and len(window) > 2 else 'linear'
+        # The fused kernel only implements linear windowing
+        if _fast.HAVE_NUMBA and function == 'linear':
+            return _fast.pipeline(array, window[:2] if window is not None else None, threshold_value, factor)
+
+        if (use_lut and isinstance(array, np.ndarray) and array.dtype.kind in 'iu' and array.dtype.isnative
+                and array.dtype.itemsize <= 2 and array.size >= 1 << (8 * array.dtype.itemsize)
+                and (window, threshold_value, contrast_value) != (None, None, None)):
+            window = tuple(window) if window is not None else None
+            lut = _pipeline_lut(array.dtype, window, threshold_value, contrast_value)
+            if lut is not None:
+                return lut[array.view(f'u{array.dtype.itemsize}')]
+
+        owned = inplace
+        if window is not None:
+            array = apply_windowing(array, window[0], window[1], inplace=owned, function=function)
+            owned = True  # Windowing returns a fresh uint8 array
+        if threshold_value is not None:
+            array = apply_threshold(array, threshold_value, inplace=owned)
+            owned = True
+        if contrast_value is not None:
+            array = adjust_contrast(array, contrast_value, inplace=owned)
+            owned = True
+        return array if owned else array.copy()
+    except Exception as e:
+        print(f"Failed to apply processing pipeline: {str(e)}")
+        return None
+
+
+def sampled_percentile(array, q, above=None, stride=4, exact_below=1 << 20):
+    """Percentile of the values greater than above, estimated from a strided sample.
+
+    Arrays with fewer than exact_below elements are used in full, so small
+    volumes get the exact value; so does a sample that misses every
+    qualifying value. Returns None when no value qualifies at all.
+    """
+    values = array
+    if array.size >= exact_below:
+        values = array[(slice(None, None, stride),) * array.ndim]
+    if above is not None:
+        values = values[values > above]
+    if values.size == 0:
+        if array.size >= exact_below:
+            return sampled_percentile(array, q, above, stride, exact_below=array.size + 1)
+        return None
+    return np.percentile(values, q)
+
+
+def block_mean(array, factors):
+    """Downsample a volume by averaging factors-sized blocks.
+
+    Partial blocks at the far edges are filled by repeating the edge voxels,
+    so the result has the same float32 shape as array[::f0, ::f1, ::f2].
+    """
+    pad = [(0, -dim % factor) for dim, factor in zip(array.shape, factors)]
+    if any(after for _, after in pad):
+        array = np.pad(array, pad, mode='edge')
+    blocks = []
+    for dim, factor in zip(array.shape, factors):
+        blocks += [dim // factor, factor]
+    return array.reshape(blocks).mean(axis=tuple(range(1, 2 * array.ndim, 2)), dtype=np.float32)
+
+
+def extract_isosurface(volume, level):
+    """Return (vertices, faces, normals, values) for the level surface of a (z, y, x) volume.
+
+    Same contract as skimage.measure.marching_cubes; uses VTK's Flying Edges
+    when VTK is installed.
+    """
+    if _surface.HAVE_VTK:
+        vertices, faces, normals = _surface.flying_edges(volume, level)
+        # Every vertex lies on the surface, so its interpolated value is the level itself
+        values = np.full(len(vertices), level, dtype=np.float32)
+        return vertices, faces, normals, values
+    # skimage's Cython kernel rejects read-only buffers such as the cached 3D volumes
+    return measure.marching_cubes(np.require(volume, requirements='W'), level=level)
+
+
+# The two most recent filter results, keyed by (id(image), filter name, parameter) and
+# holding the source image, so pressing Apply again on the same volume (or reloading an
+# unchanged file) skips the full-volume filter. prune_filter_cache drops the rest.
+_FILTER_CACHE_SIZE = 2
+_filter_cache = OrderedDict()
+_filter_cache_lock = threading.Lock()
+
+
+def _filtered_image(image, name, param, filter_fn):
+    # filter_fn(array, param) is an ndimage filter taking sigma/size as its second argument
+    key = (id(image), name, param)
+    with _filter_cache_lock:
+        entry = _filter_cache.get(key)
+        if entry is not None and entry[0] is image:
+            _filter_cache.move_to_end(key)
+            return entry[1]
+
+    # The filters write a new array, so a zero-copy view of the input is enough
+    filtered_image = sitk.GetImageFromArray(filter_fn(sitk.GetArrayViewFromImage(image), param))
+    filtered_image.CopyInformation(image)
+    with _filter_cache_lock:
+        _filter_cache[key] = (image, filtered_image)
+        while len(_filter_cache) > _FILTER_CACHE_SIZE:
+            _filter_cache.popitem(last=False)
+    return filtered_image
+
+
+def prune_filter_cache(image):
+    """Drop cached filter results computed from any volume other than image."""
+    with _filter_cache_lock:
+        for key in [key for key, (source, _) in _filter_cache.items() if source is not image]:
+            del _filter_cache[key]
+
+
 def apply_gaussian_filter(image, sigma=1):
     try:
-        array = sitk.GetArrayFromImage(image)
-        filtered_array = ndimage.gaussian_filter(array, sigma=sigma)
-        filtered_image = sitk.GetImageFromArray(filtered_array)
-        filtered_image.CopyInformation(image)
+        # scipy's gaussian_filter is already separable: one 1D pass per axis
+        filtered_image = _filtered_image(image, 'gaussian', sigma, ndimage.gaussian_filter)
         print("Gaussian filter applied with sigma =", sigma)
         return filtered_image
     except Exception as e:
@@ -156,12 +481,9 @@ def apply_gaussian_filter(image, sigma=1):
 
 def apply_median_filter(image, size=3):
     try:
-        array = sitk.GetArrayFromImage(image)
-        filtered_array = ndimage.median_filter(array, size=size)
-        filtered_image = sitk.GetImageFromArray(filtered_array)
-        filtered_image.CopyInformation(image)
+        filtered_image = _filtered_image(image, 'median', size, ndimage.median_filter)
         print("Median filter applied with size =", size)
         return filtered_image
     except Exception as e:
         print(f"Failed to apply Median filter: {str(e)}")
-        return None
\ No newline at end of file
+        return None
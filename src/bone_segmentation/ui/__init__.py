@@ -7,12 +7,19 @@ This module contains PyQt5-based GUI components including:
 - WindowingTool: CT windowing controls
 """
 
-from bone_segmentation.ui.main_window_init import MainWindow
-from bone_segmentation.ui.image_viewer import ImageViewer
-from bone_segmentation.ui.windowing_tool import WindowingTool
+from bone_segmentation import _lazy
 
-__all__ = [
+__all__ = (
     "MainWindow",
-    "ImageViewer", 
+    "ImageViewer",
     "WindowingTool",
-]
+)
+
+# PyQt5 is only imported once one of the widgets is actually requested (PEP 562)
+_LAZY_IMPORTS = {
+    "MainWindow": "bone_segmentation.ui.main_window_init",
+    "ImageViewer": "bone_segmentation.ui.image_viewer",
+    "WindowingTool": "bone_segmentation.ui.windowing_tool",
+}
+
+__getattr__, __dir__ = _lazy.attach(__name__, _LAZY_IMPORTS)
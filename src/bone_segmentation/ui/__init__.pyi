@@ -0,0 +1,10 @@
+# Static view of the lazily re-exported names in __init__.py
+from bone_segmentation.ui.main_window_init import MainWindow as MainWindow
+from bone_segmentation.ui.image_viewer import ImageViewer as ImageViewer
+from bone_segmentation.ui.windowing_tool import WindowingTool as WindowingTool
+
+__all__ = (
+    "MainWindow",
+    "ImageViewer",
+    "WindowingTool",
+)
@@ -263,6 +263,7 @@ class ImageViewer(QGraphicsView):
         self._roi_rect = None
         self._roi_graphics_item = None
         self._external_roi_update = False
+        self._pixmap_item = None
 
         # Add reference to functions for direct access
         self.functions = None
@@ -327,7 +328,8 @@ class ImageViewer(QGraphicsView):
             self.scene.clear()
             self._roi_graphics_item = None
 
-            pixmap = QPixmap.fromImage(qimage)
+            # Accept a ready-made QPixmap (cached by the caller) or a QImage
+            pixmap = qimage if isinstance(qimage, QPixmap) else QPixmap.fromImage(qimage)
             scaled_pixmap = pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
             self._pixmap_item = QGraphicsPixmapItem(scaled_pixmap)
             self._pixmap_item.setTransformationMode(Qt.SmoothTransformation)
@@ -344,6 +346,24 @@ class ImageViewer(QGraphicsView):
         except Exception as e:
             print(f"Failed to display image: {str(e)}")
 
+    def set_pixmap(self, pixmap):
+        """Swap the displayed slice in place, keeping scene rect, transform and ROI item.
+
+        Only falls back to a full display_image() rebuild when nothing is shown
+        yet or the scaled slice size differs from the current one.
+        """
+        try:
+            scaled_pixmap = pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            if self._pixmap_item is None or self._pixmap_item.pixmap().size() != scaled_pixmap.size():
+                self.display_image(pixmap)
+                return
+            self._pixmap_item.setPixmap(scaled_pixmap)
+        except RuntimeError:
+            # The pixmap item was deleted with its scene; rebuild
+            self.display_image(pixmap)
+        except Exception as e:
+            print(f"Failed to set pixmap: {str(e)}")
+
     def _redraw_roi(self):
         """Redraw ROI"""
         try:
@@ -364,6 +384,12 @@ class ImageViewer(QGraphicsView):
             print(f"Setting external ROI in {self.orientation}: {rect}")
             self._external_roi_update = True
 
+            # Reshape the existing ROI item in place; it repaints its own old and new area
+            if rect is not None and not rect.isEmpty() and self._move_roi_item(rect):
+                self._roi_rect = rect
+                self._external_roi_update = False
+                return
+
             # Remove existing ROI graphics item
             if self._roi_graphics_item:
                 try:
@@ -400,6 +426,21 @@ class ImageViewer(QGraphicsView):
             print(f"Failed to set external ROI in {self.orientation}: {str(e)}")
             self._external_roi_update = False
 
+    def _move_roi_item(self, rect):
+        """Point the current ROI item at rect, keeping any offset left by dragging; False if there is none"""
+        item = self._roi_graphics_item
+        if item is None:
+            return False
+        try:
+            if item.scene() is not self.scene:
+                return False
+            item.setRect(rect.translated(-item.pos()))
+            return True
+        except RuntimeError:
+            # The item was deleted with its scene
+            self._roi_graphics_item = None
+            return False
+
     def _force_final_update(self):
         """Force a final visual update"""
         try:
@@ -1,48 +1,174 @@
 # main_window_functions.py
 
 from bone_segmentation.core.image_processing import (
-    load_image, load_image_series, get_slice, apply_threshold, adjust_contrast,
-    create_qimage_from_slice, apply_windowing, apply_gaussian_filter, apply_median_filter
+    load_image, load_image_series, apply_threshold, adjust_contrast,
+    create_qimage_from_slice, apply_windowing, apply_gaussian_filter, apply_median_filter, apply_pipeline,
+    block_mean, sampled_percentile, extract_isosurface, warm_up_pipeline, read_window_presets,
+    prune_filter_cache
 )
-from PyQt5.QtWidgets import QFileDialog, QMessageBox, QInputDialog, QVBoxLayout, QMainWindow, QApplication
-from PyQt5.QtCore import QRectF, QTimer
+from PyQt5.QtWidgets import (QFileDialog, QMessageBox, QInputDialog, QVBoxLayout, QMainWindow, QApplication,
+                             QProgressDialog)
+from PyQt5.QtCore import QRectF, QTimer, Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap
 import SimpleITK as sitk
 import numpy as np
 from bone_segmentation.visualization.mayavi_widget import MayaviQWidget
-import traceback
+import logging
+from collections import OrderedDict
+from functools import lru_cache
 import vtk
 from stl import mesh
-from skimage import measure
+
+
+logger = logging.getLogger(__name__)
+
+# In-plane (horizontal, vertical) image axes of each slice view; 0=x, 1=y, 2=z
+VIEW_AXES = {'axial': (0, 1), 'coronal': (0, 2), 'sagittal': (1, 2)}
+# The image axis each view's scrollbar moves along
+SCROLL_AXIS = {'axial': 2, 'coronal': 1, 'sagittal': 0}
+# Largest axis of the 3D volumes: the full build and the quick preview shown before it
+VOLUME_MAX_DIM = 256
+PREVIEW_MAX_DIM = 96
+AXIS_BOUNDS = (('x_min', 'x_max'), ('y_min', 'y_max'), ('z_min', 'z_max'))
 
 
 def get_image_metadata(image):
     spacing = image.GetSpacing()  # (x, y, z) spacing in mm
-    print(f"Image Spacing: {spacing}")  # Debugging line
+    logger.debug("Image Spacing: %s", spacing)
     return spacing
 
 
+class ImageLoadSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class ImageLoadWorker(QRunnable):
+    """Read an image file or a DICOM series on a QThreadPool thread.
+
+    SimpleITK releases the GIL while reading, so the GUI stays responsive.
+    Results are delivered through the queued signals in ImageLoadSignals.
+    """
+
+    def __init__(self, filename=None, dicom_names=None):
+        super().__init__()
+        self.filename = filename
+        self.dicom_names = dicom_names
+        self.signals = ImageLoadSignals()
+        self.cancelled = False
+        self.reader = None
+
+    def cancel(self):
+        self.cancelled = True
+        if self.reader is not None:
+            self.reader.Abort()
+
+    def run(self):
+        try:
+            if self.dicom_names is not None:
+                reader = sitk.ImageSeriesReader()
+                reader.SetFileNames(self.dicom_names)
+                reader.AddCommand(sitk.sitkProgressEvent,
+                                  lambda: self.signals.progress.emit(int(reader.GetProgress() * 100)))
+                self.reader = reader
+                image = reader.Execute()
+            else:
+                image = load_image(self.filename)
+                if image is None:
+                    raise RuntimeError(f"Could not read {self.filename}")
+
+            if not self.cancelled:
+                self.signals.finished.emit(image)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class TaskWorker(QRunnable):
+    """Run fn(*args) on a QThreadPool thread and report the result through queued signals"""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(self.fn(*self.args))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
 class MainWindowFunctions:
     def __init__(self, main_window):
         self.main_window = main_window
-        self.cached_processed_array = None
-        self.cached_downsampled_array = None
-        self.cached_3d_vertices = None
-        self.cached_3d_faces = None
+        # Isosurface meshes of the most recent 3D builds and their previews, keyed by mesh_cache_key()
+        self._mesh_cache = OrderedDict()
+        # Block-averaged copies of the current raw volume for the 3D view, keyed by (id(image), factors)
+        self._downsample_cache = {}
         self.mayavi_widget = None
         self.mayavi_window = None
         self.roi_rect_3d = None
         self.roi_update_in_progress = False
+        self.load_worker = None
+        self.load_progress = None
+        self.filter_worker = None
+        self.presets_worker = None
+        self.build_3d_worker = None
+        self._rebuild_3d_pending = False  # Settings changed while a 3D build was running
+        self._np_image = None  # Zero-copy numpy view of main_window.image
+        self._np_image_source = None
+        self._geometry_cache = None  # (size, disp_scale, inv_scale), see _cache_geometry
+        self._geometry_source = None
+        # Processed 2D slices keyed by (orientation, index, pipeline_key())
+        self._processed_slice = lru_cache(maxsize=64)(self._compute_processed_slice)
+        self._qpix_cache = OrderedDict()  # Same keys -> display QPixmap
+        self._qimage = {}  # Per-view QImage buffers reused by create_qimage_from_slice
+        # Neighbouring slices rendered ahead of the scroll direction while the event loop is idle
+        self._last_index = {}
+        self._prefetch_queue = []
+        self._prefetch_timer = QTimer(singleShot=True)
+        self._prefetch_timer.timeout.connect(self._run_prefetch)
+
+        # Coalesce bursts of ROI drags and scrollbar ticks into one update per frame
+        self._pending_roi = None
+        self._roi_timer = QTimer(singleShot=True)
+        self._roi_timer.timeout.connect(self._flush_roi)
+        self._pending_views = set()
+        self._view_timer = QTimer(singleShot=True)
+        self._view_timer.timeout.connect(self._flush_view_updates)
 
         # Set up direct references for immediate updates
         self.setup_direct_references()
 
+    @property
+    def roi_rect_3d(self):
+        return self._roi_rect_3d
+
+    @roi_rect_3d.setter
+    def roi_rect_3d(self, roi):
+        # Mirror the bounds as plain ints for the per-scroll intersection checks
+        self._roi_rect_3d = roi
+        if roi:
+            self._roi_bounds = (roi.get('x_min', 0), roi.get('x_max', 0), roi.get('y_min', 0),
+                                roi.get('y_max', 0), roi.get('z_min', 0), roi.get('z_max', 0))
+        else:
+            self._roi_bounds = None
+
     def setup_direct_references(self):
         """Set up direct references between views and functions"""
         try:
             # This will be called after UI initialization
             pass
         except Exception as e:
-            print(f"Error setting up references: {e}")
+            logger.error("Error setting up references: %s", e)
 
     def fix_mayavi_colorbar(self, widget):
         """Fix colorbar display issues in Mayavi widget"""
@@ -75,11 +201,11 @@ class MainWindowFunctions:
 
                             # Final render
                             fig.scene.render()
-                            print("Colorbar created successfully")
+                            logger.debug("Colorbar created successfully")
                             return True
 
                 except Exception as e:
-                    print(f"Direct colorbar creation failed: {e}")
+                    logger.error("Direct colorbar creation failed: %s", e)
                     return False
 
                 return False
@@ -93,7 +219,7 @@ class MainWindowFunctions:
             return True
 
         except Exception as e:
-            print(f"Colorbar fix failed: {e}")
+            logger.error("Colorbar fix failed: %s", e)
             return False
 
     def apply_colorbar_fix_to_widget(self, widget):
@@ -104,21 +230,36 @@ class MainWindowFunctions:
                 if not hasattr(widget, 'fix_colorbar_display'):
                     widget.fix_colorbar_display = lambda: self.fix_mayavi_colorbar(widget)
 
-                # Apply the fix
-                QTimer.singleShot(1000, widget.fix_colorbar_display)
+                # Apply the fix once, when the 3D view is first actually shown
+                if getattr(widget, '_colorbar_fixed', False):
+                    return
+                widget._colorbar_fixed = True
+                if hasattr(widget, 'call_on_first_show'):
+                    widget.call_on_first_show(widget.fix_colorbar_display)
+                else:
+                    QTimer.singleShot(1000, widget.fix_colorbar_display)
 
         except Exception as e:
-            print(f"Failed to apply colorbar fix to widget: {e}")
+            logger.error("Failed to apply colorbar fix to widget: %s", e)
 
     def on_roi_changed_immediate(self, rect, source_orientation):
-        """Immediate ROI change handler for real-time updates"""
+        """Immediate ROI change handler for real-time updates (debounced to ~60 Hz)"""
+        self._pending_roi = (QRectF(rect), source_orientation)
+        self._roi_timer.start(16)
+
+    def _flush_roi(self):
         try:
+            if self._pending_roi is None:
+                return
+            rect, source_orientation = self._pending_roi
+            self._pending_roi = None
+
             if self.roi_update_in_progress:
                 return
 
             self.roi_update_in_progress = True
 
-            print(f"IMMEDIATE ROI update from {source_orientation}: {rect}")
+            logger.debug("IMMEDIATE ROI update from %s: %s", source_orientation, rect)
 
             # Convert to 3D and immediately propagate
             self.roi_rect_3d = self.convert_roi_to_3d_preserving_dimensions(rect, source_orientation)
@@ -130,86 +271,58 @@ class MainWindowFunctions:
 
             self.roi_update_in_progress = False
         except Exception as e:
-            print(f"Error in immediate ROI update: {e}")
+            logger.error("Error in immediate ROI update: %s", e)
             self.roi_update_in_progress = False
 
+    def _project(self, orientation):
+        """Project the 3D ROI onto one view as a display-space QRectF"""
+        u, v = VIEW_AXES[orientation]
+        _, disp_scale, _ = self._geometry()
+        u_min = self.roi_rect_3d[AXIS_BOUNDS[u][0]]
+        u_max = self.roi_rect_3d[AXIS_BOUNDS[u][1]]
+        v_min = self.roi_rect_3d[AXIS_BOUNDS[v][0]]
+        v_max = self.roi_rect_3d[AXIS_BOUNDS[v][1]]
+        return QRectF(u_min * disp_scale[u], v_min * disp_scale[v],
+                      (u_max - u_min) * disp_scale[u], (v_max - v_min) * disp_scale[v])
+
     def propagate_roi_immediate(self, source_orientation):
         """Immediate ROI propagation for real-time updates"""
         try:
             if not self.roi_rect_3d:
                 return
 
-            size = self.main_window.image.GetSize()
-            display_width = 400
-            display_height = 400
-
-            print(f"Propagating ROI immediately from {source_orientation}")
-            print(f"ROI 3D bounds: x={self.roi_rect_3d['x_min']}-{self.roi_rect_3d['x_max']}, "
-                  f"y={self.roi_rect_3d['y_min']}-{self.roi_rect_3d['y_max']}, "
-                  f"z={self.roi_rect_3d['z_min']}-{self.roi_rect_3d['z_max']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                roi = self.roi_rect_3d
+                logger.debug("Propagating ROI immediately from %s", source_orientation)
+                logger.debug("ROI 3D bounds: x=%s-%s, y=%s-%s, z=%s-%s", roi['x_min'], roi['x_max'],
+                             roi['y_min'], roi['y_max'], roi['z_min'], roi['z_max'])
 
             # Update all other views immediately with error handling
             views_to_update = []
+            for orientation in VIEW_AXES:
+                if orientation != source_orientation:
+                    rect = self._project(orientation)
+                    logger.debug("%s ROI rect: %s", orientation, rect)
+                    if rect.width() > 1 and rect.height() > 1:
+                        views_to_update.append((getattr(self.main_window, f'{orientation}_view'), rect))
 
-            if source_orientation != 'axial':
-                scale_x = display_width / size[0]
-                scale_y = display_height / size[1]
-
-                axial_rect = QRectF(
-                    self.roi_rect_3d['x_min'] * scale_x,
-                    self.roi_rect_3d['y_min'] * scale_y,
-                    (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                    (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y
-                )
-
-                print(f"Axial ROI rect: {axial_rect}")
-                if axial_rect.width() > 1 and axial_rect.height() > 1:
-                    views_to_update.append((self.main_window.axial_view, axial_rect))
-
-            if source_orientation != 'coronal':
-                scale_x = display_width / size[0]
-                scale_z = display_height / size[2]
-
-                coronal_rect = QRectF(
-                    self.roi_rect_3d['x_min'] * scale_x,
-                    self.roi_rect_3d['z_min'] * scale_z,
-                    (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                    (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                )
-
-                print(f"Coronal ROI rect: {coronal_rect}")
-                if coronal_rect.width() > 1 and coronal_rect.height() > 1:
-                    views_to_update.append((self.main_window.coronal_view, coronal_rect))
-
-            if source_orientation != 'sagittal':
-                scale_y = display_width / size[1]
-                scale_z = display_height / size[2]
-
-                sagittal_rect = QRectF(
-                    self.roi_rect_3d['y_min'] * scale_y,
-                    self.roi_rect_3d['z_min'] * scale_z,
-                    (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y,
-                    (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                )
-
-                print(f"Sagittal ROI rect: {sagittal_rect}")
-                if sagittal_rect.width() > 1 and sagittal_rect.height() > 1:
-                    views_to_update.append((self.main_window.sagittal_view, sagittal_rect))
-
-            # Apply updates to all views with individual error handling
-            for view, rect in views_to_update:
-                try:
-                    print(f"Setting ROI in {view.orientation} view: {rect}")
-                    view.set_roi_from_external(rect)
-                    # Force additional visual updates
-                    view.scene.update()
-                    view.update()
+            # Apply updates to all views with painting suspended, then repaint each once
+            for view, _ in views_to_update:
+                view.setUpdatesEnabled(False)
+            try:
+                for view, rect in views_to_update:
+                    try:
+                        logger.debug("Setting ROI in %s view: %s", view.orientation, rect)
+                        view.set_roi_from_external(rect)
+                    except Exception as view_error:
+                        logger.error("Error updating %s view: %s", view.orientation, view_error)
+            finally:
+                for view, _ in views_to_update:
+                    view.setUpdatesEnabled(True)
                     view.viewport().update()
-                except Exception as view_error:
-                    print(f"Error updating {view.orientation} view: {view_error}")
 
         except Exception as e:
-            print(f"Error in immediate propagation: {e}")
+            logger.error("Error in immediate propagation: %s", e)
 
     def navigate_views_to_show_roi(self):
         """Navigate all views to slices where ROI is visible"""
@@ -222,23 +335,24 @@ class MainWindowFunctions:
             y_center = (self.roi_rect_3d['y_min'] + self.roi_rect_3d['y_max']) // 2
             z_center = (self.roi_rect_3d['z_min'] + self.roi_rect_3d['z_max']) // 2
 
-            print(f"Navigating views to ROI center: x={x_center}, y={y_center}, z={z_center}")
+            logger.debug("Navigating views to ROI center: x=%s, y=%s, z=%s", x_center, y_center, z_center)
 
-            # Navigate each view to show the ROI
-            # Axial view shows Z slices, navigate to Z center
-            if z_center != self.main_window.axial_scrollbar.value():
-                self.main_window.axial_scrollbar.setValue(z_center)
-
-            # Coronal view shows Y slices, navigate to Y center
-            if y_center != self.main_window.coronal_scrollbar.value():
-                self.main_window.coronal_scrollbar.setValue(y_center)
-
-            # Sagittal view shows X slices, navigate to X center
-            if x_center != self.main_window.sagittal_scrollbar.value():
-                self.main_window.sagittal_scrollbar.setValue(x_center)
+            # Navigate each view to show the ROI: axial shows Z slices, coronal Y, sagittal X.
+            # Signals stay blocked while the values move so each changed view repaints exactly once.
+            targets = (('axial', z_center), ('coronal', y_center), ('sagittal', x_center))
+            for orientation, center in targets:
+                scrollbar = getattr(self.main_window, f'{orientation}_scrollbar')
+                if center == scrollbar.value():
+                    continue
+                scrollbar.blockSignals(True)
+                try:
+                    scrollbar.setValue(center)
+                finally:
+                    scrollbar.blockSignals(False)
+                self.schedule_view_update(orientation)
 
         except Exception as e:
-            print(f"Error navigating views to ROI: {e}")
+            logger.error("Error navigating views to ROI: %s", e)
 
     def showFileDialog(self):
         try:
@@ -270,21 +384,7 @@ class MainWindowFunctions:
 
     def processImage(self, filename):
         try:
-            self.main_window.image = load_image(filename)
-            self.main_window.threshold_applied = False  # Reset threshold applied flag
-            self.main_window.contrast_applied = False
-            self.main_window.windowing_applied = False
-            self.update_scrollbars()
-            self.update_views()
-
-            # Enable buttons after dataset is loaded
-            self.main_window.apply_threshold_button.setEnabled(True)
-            self.main_window.apply_contrast_button.setEnabled(True)
-            self.main_window.apply_windowing_button.setEnabled(True)
-            self.main_window.build_3d_button.setEnabled(True)
-            self.main_window.apply_filter_button.setEnabled(True)
-            self.main_window.export_3d_button.setEnabled(True)
-            self.main_window.clear_roi_button.setEnabled(True)
+            self.start_image_load(ImageLoadWorker(filename=filename), "Loading image...")
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to load image: {str(e)}")
 
@@ -303,13 +403,79 @@ class MainWindowFunctions:
             else:
                 dicom_names = reader.GetGDCMSeriesFileNames(folder, series_ids[0])
 
-            reader.SetFileNames(dicom_names)
-            self.main_window.image = reader.Execute()
-            self.main_window.threshold_applied = False
+            self.start_image_load(ImageLoadWorker(dicom_names=dicom_names), "Loading image series...")
+
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Error", f"Failed to load image series: {str(e)}")
+
+    def start_image_load(self, worker, label):
+        """Run an ImageLoadWorker in the global thread pool behind a cancellable progress dialog"""
+        if self.load_worker is not None:
+            return  # A load is already in flight
+
+        self.load_worker = worker
+        self.main_window.loadFolderButton.setEnabled(False)
+
+        progress = QProgressDialog(label, "Cancel", 0, 100, self.main_window)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoReset(False)
+        progress.canceled.connect(self.cancel_image_load)
+        self.load_progress = progress
+
+        worker.signals.progress.connect(progress.setValue)
+        worker.signals.finished.connect(self._on_image_loaded)
+        worker.signals.failed.connect(self._on_image_load_failed)
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_image_load(self):
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self._finish_image_load()
+
+    def _finish_image_load(self):
+        self.load_worker = None
+        self.main_window.loadFolderButton.setEnabled(True)
+        if self.load_progress is not None:
+            self.load_progress.canceled.disconnect(self.cancel_image_load)
+            self.load_progress.close()
+            self.load_progress = None
+
+    def load_window_presets(self, load_worker):
+        """Offer the window presets from the loaded file's DICOM header, read off the UI thread"""
+        self.main_window.windowing_tool.set_series_presets(())
+        if load_worker is None:
+            self.presets_worker = None
+            return
+        source = load_worker.filename if load_worker.filename is not None else load_worker.dicom_names[0]
+        worker = TaskWorker(read_window_presets, source)
+        # Ignore the result if another image was loaded before it arrived
+        worker.signals.finished.connect(
+            lambda presets: worker is self.presets_worker and
+            self.main_window.windowing_tool.set_series_presets(presets))
+        self.presets_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_image_loaded(self, image):
+        try:
+            worker = self.load_worker
+            self._finish_image_load()
+
+            self.main_window.image = image
+            self._np_image = None
+            if worker is not None and worker.filename is None:
+                # Series are read directly, not through load_image; release the last file's volume
+                load_image.cache_clear()
+            # Filter results of the previous volume are no longer reachable from the UI
+            prune_filter_cache(image)
+            self.main_window.threshold_applied = False  # Reset threshold applied flag
             self.main_window.contrast_applied = False
             self.main_window.windowing_applied = False
             self.update_scrollbars()
             self.update_views()
+            # Compile the processing kernel for this volume's dtype before the first Apply needs it
+            QThreadPool.globalInstance().start(TaskWorker(warm_up_pipeline, self.image_array().dtype))
+            self.load_window_presets(worker)
 
             # Enable buttons after dataset is loaded
             self.main_window.apply_threshold_button.setEnabled(True)
@@ -318,9 +484,14 @@ class MainWindowFunctions:
             self.main_window.build_3d_button.setEnabled(True)
             self.main_window.apply_filter_button.setEnabled(True)
             self.main_window.clear_roi_button.setEnabled(True)
-
+            if worker is not None and worker.filename is not None:
+                self.main_window.export_3d_button.setEnabled(True)
         except Exception as e:
-            QMessageBox.critical(self.main_window, "Error", f"Failed to load image series: {str(e)}")
+            QMessageBox.critical(self.main_window, "Error", f"Failed to load image: {str(e)}")
+
+    def _on_image_load_failed(self, message):
+        self._finish_image_load()
+        QMessageBox.critical(self.main_window, "Error", f"Failed to load image: {message}")
 
     def on_roi_changed(self, rect, source_orientation):
         """Handle ROI changes from any view and propagate to others"""
@@ -331,11 +502,11 @@ class MainWindowFunctions:
 
             self.roi_update_in_progress = True
 
-            print(f"ROI changed in {source_orientation}: {rect}")
+            logger.debug("ROI changed in %s: %s", source_orientation, rect)
 
             if rect is None or rect.isEmpty():
                 # Clear ROI in all views
-                print("Clearing ROI in all views")
+                logger.debug("Clearing ROI in all views")
                 self.roi_rect_3d = None
                 views = [self.main_window.coronal_view, self.main_window.sagittal_view, self.main_window.axial_view]
                 for view in views:
@@ -345,17 +516,17 @@ class MainWindowFunctions:
                 # Convert 2D ROI to 3D coordinates and propagate to other views
                 self.roi_rect_3d = self.convert_roi_to_3d_preserving_dimensions(rect, source_orientation)
                 if self.roi_rect_3d:
-                    print(f"Propagating ROI from {source_orientation} to other views")
+                    logger.debug("Propagating ROI from %s to other views", source_orientation)
                     # Navigate other views to show ROI
                     self.navigate_views_to_show_roi()
                     # Propagate to other views
                     self.propagate_roi_to_views(source_orientation)
                 else:
-                    print("Failed to convert ROI to 3D coordinates")
+                    logger.error("Failed to convert ROI to 3D coordinates")
 
             self.roi_update_in_progress = False
         except Exception as e:
-            print(f"Failed to handle ROI change: {str(e)}")
+            logger.error("Failed to handle ROI change: %s", e)
             self.roi_update_in_progress = False
 
     def convert_roi_to_3d_preserving_dimensions(self, rect, orientation):
@@ -364,19 +535,15 @@ class MainWindowFunctions:
             if not self.main_window.image:
                 return None
 
-            # Get image dimensions
-            size = self.main_window.image.GetSize()  # (width, height, depth)
+            # Get image dimensions (width, height, depth) and display-to-voxel scales
+            size, _, inv_scale = self._geometry()
 
             # Get current slice indices
             axial_index = self.main_window.axial_scrollbar.value()
             coronal_index = self.main_window.coronal_scrollbar.value()
             sagittal_index = self.main_window.sagittal_scrollbar.value()
 
-            # Get the actual display size of the image in the viewer
-            display_width = 400
-            display_height = 400
-
-            print(f"Converting ROI from {orientation}: rect={rect}, image_size={size}")
+            logger.debug("Converting ROI from %s: rect=%s, image_size=%s", orientation, rect, size)
 
             # Start with existing ROI dimensions if available
             if self.roi_rect_3d:
@@ -386,70 +553,33 @@ class MainWindowFunctions:
                 y_max = self.roi_rect_3d.get('y_max', size[1])
                 z_min = self.roi_rect_3d.get('z_min', 0)
                 z_max = self.roi_rect_3d.get('z_max', size[2])
-                print(f"Starting with existing ROI: x={x_min}-{x_max}, y={y_min}-{y_max}, z={z_min}-{z_max}")
+                logger.debug("Starting with existing ROI: x=%s-%s, y=%s-%s, z=%s-%s",
+                             x_min, x_max, y_min, y_max, z_min, z_max)
             else:
                 # Initialize with default thickness if no existing ROI
                 x_min, x_max = 0, size[0]
                 y_min, y_max = 0, size[1]
                 z_min, z_max = 0, size[2]
-                print("No existing ROI, initializing with full volume")
-
-            if orientation == 'axial':
-                # For axial view: X axis is width, Y axis is height
-                # Update X and Y dimensions, preserve Z
-                scale_x = size[0] / display_width
-                scale_y = size[1] / display_height
-
-                # Update only X and Y coordinates from the 2D ROI
-                x_min = max(0, int(rect.x() * scale_x))
-                x_max = min(size[0], int((rect.x() + rect.width()) * scale_x))
-                y_min = max(0, int(rect.y() * scale_y))
-                y_max = min(size[1], int((rect.y() + rect.height()) * scale_y))
-
-                # If no existing ROI, set a reasonable Z thickness around current slice
-                if not self.roi_rect_3d:
-                    z_center = axial_index
-                    z_thickness = max(1, size[2] // 10)  # Use 10% of volume thickness
-                    z_min = max(0, z_center - z_thickness // 2)
-                    z_max = min(size[2], z_center + z_thickness // 2)
-
-            elif orientation == 'coronal':
-                # For coronal view: X axis is width, Z axis is depth (displayed as height)
-                # Update X and Z dimensions, preserve Y
-                scale_x = size[0] / display_width
-                scale_z = size[2] / display_height
-
-                # Update only X and Z coordinates from the 2D ROI
-                x_min = max(0, int(rect.x() * scale_x))
-                x_max = min(size[0], int((rect.x() + rect.width()) * scale_x))
-                z_min = max(0, int(rect.y() * scale_z))
-                z_max = min(size[2], int((rect.y() + rect.height()) * scale_z))
-
-                # If no existing ROI, set a reasonable Y thickness around current slice
+                logger.debug("No existing ROI, initializing with full volume")
+
+            bounds = [[x_min, x_max], [y_min, y_max], [z_min, z_max]]
+            if orientation in VIEW_AXES:
+                # Update the two in-plane axes from the 2D ROI, preserve the depth axis
+                # (scalar clamps beat np.clip on a handful of values)
+                u, v = VIEW_AXES[orientation]
+                su, sv = inv_scale[u], inv_scale[v]
+                left, top, right, bottom = rect.left(), rect.top(), rect.right(), rect.bottom()
+                bounds[u] = [max(0, int(left * su)), min(size[u], int(right * su))]
+                bounds[v] = [max(0, int(top * sv)), min(size[v], int(bottom * sv))]
+
+                # If no existing ROI, set a reasonable thickness around the current slice
                 if not self.roi_rect_3d:
-                    y_center = coronal_index
-                    y_thickness = max(1, size[1] // 10)  # Use 10% of volume thickness
-                    y_min = max(0, y_center - y_thickness // 2)
-                    y_max = min(size[1], y_center + y_thickness // 2)
-
-            elif orientation == 'sagittal':
-                # For sagittal view: Y axis is height (displayed as width), Z axis is depth (displayed as height)
-                # Update Y and Z dimensions, preserve X
-                scale_y = size[1] / display_width
-                scale_z = size[2] / display_height
-
-                # Update only Y and Z coordinates from the 2D ROI
-                y_min = max(0, int(rect.x() * scale_y))
-                y_max = min(size[1], int((rect.x() + rect.width()) * scale_y))
-                z_min = max(0, int(rect.y() * scale_z))
-                z_max = min(size[2], int((rect.y() + rect.height()) * scale_z))
-
-                # If no existing ROI, set a reasonable X thickness around current slice
-                if not self.roi_rect_3d:
-                    x_center = sagittal_index
-                    x_thickness = max(1, size[0] // 10)  # Use 10% of volume thickness
-                    x_min = max(0, x_center - x_thickness // 2)
-                    x_max = min(size[0], x_center + x_thickness // 2)
+                    depth = 3 - u - v
+                    center = (sagittal_index, coronal_index, axial_index)[depth]
+                    thickness = max(1, size[depth] // 10)  # Use 10% of volume thickness
+                    bounds[depth] = [max(0, center - thickness // 2),
+                                     min(size[depth], center + thickness // 2)]
+            (x_min, x_max), (y_min, y_max), (z_min, z_max) = bounds
 
             result = {
                 'x_min': x_min, 'x_max': x_max,
@@ -457,11 +587,11 @@ class MainWindowFunctions:
                 'z_min': z_min, 'z_max': z_max,
                 'source_orientation': orientation
             }
-            print(f"Final 3D ROI: {result}")
+            logger.debug("Final 3D ROI: %s", result)
             return result
 
         except Exception as e:
-            print(f"Failed to convert ROI to 3D: {str(e)}")
+            logger.error("Failed to convert ROI to 3D: %s", e)
             return None
 
     def convert_roi_to_3d(self, rect, orientation):
@@ -474,120 +604,32 @@ class MainWindowFunctions:
             if not self.roi_rect_3d:
                 return
 
-            size = self.main_window.image.GetSize()
-            display_width = 400
-            display_height = 400
-
-            views_to_update = []
-
-            if source_orientation != 'axial':
-                # Update axial view - project 3D ROI onto axial plane
-                scale_x = display_width / size[0]
-                scale_y = display_height / size[1]
-
-                # Ensure we have valid coordinates for axial projection
-                if 'x_min' in self.roi_rect_3d and 'y_min' in self.roi_rect_3d:
-                    axial_rect = QRectF(
-                        self.roi_rect_3d['x_min'] * scale_x,
-                        self.roi_rect_3d['y_min'] * scale_y,
-                        (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                        (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y
-                    )
-                    views_to_update.append((self.main_window.axial_view, axial_rect))
-
-            if source_orientation != 'coronal':
-                # Update coronal view - project 3D ROI onto coronal plane
-                scale_x = display_width / size[0]
-                scale_z = display_height / size[2]
-
-                # Ensure we have valid coordinates for coronal projection
-                if 'x_min' in self.roi_rect_3d and 'z_min' in self.roi_rect_3d:
-                    coronal_rect = QRectF(
-                        self.roi_rect_3d['x_min'] * scale_x,
-                        self.roi_rect_3d['z_min'] * scale_z,
-                        (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                        (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                    )
-                    views_to_update.append((self.main_window.coronal_view, coronal_rect))
-
-            if source_orientation != 'sagittal':
-                # Update sagittal view - project 3D ROI onto sagittal plane
-                scale_y = display_width / size[1]
-                scale_z = display_height / size[2]
-
-                # Ensure we have valid coordinates for sagittal projection
-                if 'y_min' in self.roi_rect_3d and 'z_min' in self.roi_rect_3d:
-                    sagittal_rect = QRectF(
-                        self.roi_rect_3d['y_min'] * scale_y,
-                        self.roi_rect_3d['z_min'] * scale_z,
-                        (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y,
-                        (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                    )
-                    views_to_update.append((self.main_window.sagittal_view, sagittal_rect))
-
-            # Update the views with proper error handling
-            for view, rect in views_to_update:
-                try:
-                    # Ensure the rect has valid dimensions
-                    if rect.width() > 1 and rect.height() > 1:
-                        view.set_roi_from_external(rect)
-                except Exception as e:
-                    print(f"Error updating view {view.orientation}: {e}")
+            for orientation in VIEW_AXES:
+                if orientation != source_orientation:
+                    view = getattr(self.main_window, f'{orientation}_view')
+                    try:
+                        rect = self._project(orientation)
+                        # Ensure the rect has valid dimensions
+                        if rect.width() > 1 and rect.height() > 1:
+                            view.set_roi_from_external(rect)
+                    except Exception as e:
+                        logger.error("Error updating view %s: %s", view.orientation, e)
 
         except Exception as e:
-            print(f"Failed to propagate ROI to views: {str(e)}")
+            logger.error("Failed to propagate ROI to views: %s", e)
 
     def propagate_roi_to_single_view(self, target_orientation):
         """Propagate ROI to a single specific view"""
         try:
-            if not self.roi_rect_3d:
+            if not self.roi_rect_3d or target_orientation not in VIEW_AXES:
                 return
 
-            size = self.main_window.image.GetSize()
-            display_width = 400
-            display_height = 400
-
-            if target_orientation == 'axial' and 'x_min' in self.roi_rect_3d and 'y_min' in self.roi_rect_3d:
-                scale_x = display_width / size[0]
-                scale_y = display_height / size[1]
-
-                axial_rect = QRectF(
-                    self.roi_rect_3d['x_min'] * scale_x,
-                    self.roi_rect_3d['y_min'] * scale_y,
-                    (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                    (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y
-                )
-                if axial_rect.width() > 1 and axial_rect.height() > 1:
-                    self.main_window.axial_view.set_roi_from_external(axial_rect)
-
-            elif target_orientation == 'coronal' and 'x_min' in self.roi_rect_3d and 'z_min' in self.roi_rect_3d:
-                scale_x = display_width / size[0]
-                scale_z = display_height / size[2]
-
-                coronal_rect = QRectF(
-                    self.roi_rect_3d['x_min'] * scale_x,
-                    self.roi_rect_3d['z_min'] * scale_z,
-                    (self.roi_rect_3d['x_max'] - self.roi_rect_3d['x_min']) * scale_x,
-                    (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                )
-                if coronal_rect.width() > 1 and coronal_rect.height() > 1:
-                    self.main_window.coronal_view.set_roi_from_external(coronal_rect)
-
-            elif target_orientation == 'sagittal' and 'y_min' in self.roi_rect_3d and 'z_min' in self.roi_rect_3d:
-                scale_y = display_width / size[1]
-                scale_z = display_height / size[2]
-
-                sagittal_rect = QRectF(
-                    self.roi_rect_3d['y_min'] * scale_y,
-                    self.roi_rect_3d['z_min'] * scale_z,
-                    (self.roi_rect_3d['y_max'] - self.roi_rect_3d['y_min']) * scale_y,
-                    (self.roi_rect_3d['z_max'] - self.roi_rect_3d['z_min']) * scale_z
-                )
-                if sagittal_rect.width() > 1 and sagittal_rect.height() > 1:
-                    self.main_window.sagittal_view.set_roi_from_external(sagittal_rect)
+            rect = self._project(target_orientation)
+            if rect.width() > 1 and rect.height() > 1:
+                getattr(self.main_window, f'{target_orientation}_view').set_roi_from_external(rect)
 
         except Exception as e:
-            print(f"Failed to propagate ROI to single view {target_orientation}: {str(e)}")
+            logger.error("Failed to propagate ROI to single view %s: %s", target_orientation, e)
 
     def clear_roi(self):
         """Clear ROI from all views"""
@@ -599,34 +641,104 @@ class MainWindowFunctions:
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to clear ROI: {str(e)}")
 
-    def get_roi_mask(self, image_array):
-        """Create a mask for the ROI region"""
+    def get_roi_slices(self, shape):
+        """Return the ROI as a (z, y, x) tuple of slices clamped to shape, or None"""
         try:
             if not self.roi_rect_3d:
                 return None
 
-            mask = np.zeros(image_array.shape, dtype=bool)
-
             # Apply ROI bounds
             x_min = max(0, self.roi_rect_3d.get('x_min', 0))
-            x_max = min(image_array.shape[2], self.roi_rect_3d.get('x_max', image_array.shape[2]))
+            x_max = min(shape[2], self.roi_rect_3d.get('x_max', shape[2]))
             y_min = max(0, self.roi_rect_3d.get('y_min', 0))
-            y_max = min(image_array.shape[1], self.roi_rect_3d.get('y_max', image_array.shape[1]))
+            y_max = min(shape[1], self.roi_rect_3d.get('y_max', shape[1]))
             z_min = max(0, self.roi_rect_3d.get('z_min', 0))
-            z_max = min(image_array.shape[0], self.roi_rect_3d.get('z_max', image_array.shape[0]))
+            z_max = min(shape[0], self.roi_rect_3d.get('z_max', shape[0]))
 
-            mask[z_min:z_max, y_min:y_max, x_min:x_max] = True
-
-            return mask
+            return (slice(z_min, z_max), slice(y_min, y_max), slice(x_min, x_max))
         except Exception as e:
-            print(f"Failed to create ROI mask: {str(e)}")
+            logger.error("Failed to compute ROI slices: %s", e)
             return None
 
+    def downsample_roi_slices(self, roi_slices, factors):
+        """Map full-resolution ROI slices onto a volume downsampled by factors"""
+        # Downsampled voxel i starts at full voxel i*f and is kept when that voxel is in the ROI
+        return tuple(slice(-(-s.start // f), -(-s.stop // f)) for s, f in zip(roi_slices, factors))
+
+    def pad_roi_slices(self, roi_slices, shape, pad=1):
+        """Grow ROI slices by pad voxels on every side, clamped to shape"""
+        return tuple(slice(max(0, s.start - pad), min(dim, s.stop + pad)) for s, dim in zip(roi_slices, shape))
+
+    def downsample_factors(self, shape, max_dim=VOLUME_MAX_DIM):
+        """Return the (z, y, x) factors that bring shape down to about max_dim voxels per axis"""
+        if max(shape) > max_dim:
+            return tuple(max(1, dim // max_dim) for dim in shape)
+        return (1, 1, 1)
+
+    def downsample_volume(self, image_array, factors):
+        """Return a read-only float32 block-averaged copy of image_array; safe on a worker thread"""
+        if factors == (1, 1, 1):
+            # The 3D path works in float32 throughout, so convert once here rather than per build
+            volume = np.ascontiguousarray(image_array, dtype=np.float32)
+        else:
+            # Averaging instead of point sampling keeps thin structures from aliasing away
+            volume = block_mean(image_array, factors)
+        volume.flags.writeable = False
+        return volume
+
+    def cache_downsampled_volume(self, image, factors, volume):
+        """Keep the downsampled volume of image for later 3D builds (GUI thread only)"""
+        key = (id(image), factors)
+        # Keep the preview and full-size volumes of this image side by side
+        cache = {k: v for k, v in self._downsample_cache.items() if k[0] == key[0]}
+        cache[key] = volume
+        self._downsample_cache = cache
+
+    def process_within_roi(self, image_array, roi_slices, any_processing_applied, pipeline=None):
+        """Run the processing pipeline on the ROI box only and zero everything outside it
+
+        pipeline is a pipeline_key() captured on the GUI thread; when None the current settings are used.
+        """
+        region = image_array[roi_slices]
+        if any_processing_applied:
+            region = self.apply_processing(region) if pipeline is None else apply_pipeline(region, *pipeline)
+        result = np.zeros(image_array.shape, dtype=region.dtype)
+        result[roi_slices] = region
+        return result
+
+    def zero_outside_roi(self, array, roi_slices):
+        """Zero everything outside the ROI box in place, writing only the bands around it"""
+        for axis, s in enumerate(roi_slices):
+            index = (slice(None),) * axis
+            array[index + (slice(None, s.start),)] = 0
+            array[index + (slice(s.stop, None),)] = 0
+        return array
+
+    def keep_roi_only(self, image_array, roi_slices, dtype=None):
+        """Copy image_array (optionally converting to dtype) with everything outside the ROI box zeroed"""
+        return self.zero_outside_roi(np.array(image_array, dtype=dtype), roi_slices)
+
+    def _cache_geometry(self):
+        """Cache the image size and the voxel<->display scale factors for the 400x400 views"""
+        image = self.main_window.image
+        size = image.GetSize()
+        disp_scale = (400.0 / size[0], 400.0 / size[1], 400.0 / size[2])
+        inv_scale = (size[0] / 400.0, size[1] / 400.0, size[2] / 400.0)
+        self._geometry_cache = (size, disp_scale, inv_scale)
+        self._geometry_source = image
+        return self._geometry_cache
+
+    def _geometry(self):
+        if self._geometry_source is not self.main_window.image:
+            return self._cache_geometry()
+        return self._geometry_cache
+
     def update_scrollbars(self):
         try:
-            self.main_window.coronal_scrollbar.setMaximum(self.main_window.image.GetHeight() - 1)
-            self.main_window.sagittal_scrollbar.setMaximum(self.main_window.image.GetWidth() - 1)
-            self.main_window.axial_scrollbar.setMaximum(self.main_window.image.GetDepth() - 1)
+            width, height, depth = self._cache_geometry()[0]
+            self.main_window.coronal_scrollbar.setMaximum(height - 1)
+            self.main_window.sagittal_scrollbar.setMaximum(width - 1)
+            self.main_window.axial_scrollbar.setMaximum(depth - 1)
 
             # Enable the scrollbars now that an image has been loaded
             self.main_window.coronal_scrollbar.setEnabled(True)
@@ -636,23 +748,114 @@ class MainWindowFunctions:
             QMessageBox.critical(self.main_window, "Error", f"Failed to update scrollbars: {str(e)}")
 
     def update_views(self):
+        """Queue a repaint of all three views; calls before the next event-loop pass share one redraw"""
         try:
+            self._pending_views.update(('coronal', 'sagittal', 'axial'))
+            self._view_timer.start(0)
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Error", f"Failed to update views: {str(e)}")
+
+    def image_array(self):
+        """Return a cached zero-copy (z, y, x) view of the current SimpleITK image"""
+        image = self.main_window.image
+        if self._np_image is None or self._np_image_source is not image:
+            self._np_image = sitk.GetArrayViewFromImage(image)
+            self._np_image_source = image  # Keeps the viewed buffer alive
+            self._processed_slice.cache_clear()
+            self._qpix_cache.clear()
+            self._mesh_cache.clear()
+            self._downsample_cache.clear()
+        return self._np_image
+
+    def pipeline_key(self):
+        """Hashable summary of the 2D processing settings currently in effect"""
+        mw = self.main_window
+        return (
+            mw.windowing_tool.get_window() if mw.windowing_applied else None,
+            mw.threshold_slider.value() if mw.threshold_applied else None,
+            mw.contrast_slider.value() if mw.contrast_applied else None,
+        )
+
+    def slice_pixmap(self, orientation, index, prefetch=True):
+        """Return the display QPixmap for a slice, cached under the processed-slice key"""
+        self.image_array()  # Drops cached pixmaps if the image was replaced
+        if prefetch:
+            self._schedule_prefetch(orientation, index)
+        key = (orientation, index, self.pipeline_key())
+        pixmap = self._qpix_cache.get(key)
+        if pixmap is not None:
+            self._qpix_cache.move_to_end(key)
+            return pixmap
+
+        qimage = create_qimage_from_slice(self._processed_slice(*key), target_size=(400, 400),
+                                          out=self._qimage.get(orientation))
+        self._qimage[orientation] = qimage
+        pixmap = QPixmap.fromImage(qimage)
+        self._qpix_cache[key] = pixmap
+        if len(self._qpix_cache) > 32:
+            self._qpix_cache.popitem(last=False)
+        return pixmap
+
+    def _schedule_prefetch(self, orientation, index):
+        """Queue the next two slices in the direction the view is being scrolled"""
+        step = -1 if index < self._last_index.get(orientation, index) else 1
+        self._last_index[orientation] = index
+        self._prefetch_queue = [(o, i) for o, i in self._prefetch_queue if o != orientation]
+        self._prefetch_queue += [(orientation, index + step), (orientation, index + 2 * step)]
+        self._prefetch_timer.start(0)
+
+    def _run_prefetch(self):
+        """Render one queued slice per idle tick so scrolling input is never held up"""
+        try:
+            if not self._prefetch_queue or self.main_window.image is None:
+                return
+            orientation, index = self._prefetch_queue.pop(0)
+            depth = self.image_array().shape[('axial', 'coronal', 'sagittal').index(orientation)]
+            if 0 <= index < depth:
+                self.slice_pixmap(orientation, index, prefetch=False)
+            if self._prefetch_queue:
+                self._prefetch_timer.start(0)
+        except Exception as e:
+            logger.debug("Slice prefetch failed: %s", e)
+
+    def _compute_processed_slice(self, orientation, index, pipeline_key):
+        array = self.image_array()
+        if orientation == 'axial':
+            slice = array[index, :, :]
+        elif orientation == 'coronal':
+            slice = array[:, index, :]
+        else:
+            slice = array[:, :, index]
+        if pipeline_key == (None, None, None):
+            # Nothing to apply: a read-only view of the volume is enough for display
+            processed_slice = slice.view()
+        else:
+            processed_slice = self.apply_processing(slice)
+        processed_slice.setflags(write=False)  # shared through the cache
+        return processed_slice
+
+    def schedule_view_update(self, orientation):
+        """Queue a repaint of one slice view; bursts of scrollbar ticks collapse into one"""
+        self._pending_views.add(orientation)
+        self._view_timer.start(16)
+
+    def _flush_view_updates(self):
+        pending = self._pending_views
+        self._pending_views = set()
+        if 'coronal' in pending:
             self.update_coronal_view()
+        if 'sagittal' in pending:
             self.update_sagittal_view()
+        if 'axial' in pending:
             self.update_axial_view()
-        except Exception as e:
-            QMessageBox.critical(self.main_window, "Error", f"Failed to update views: {str(e)}")
 
     def update_coronal_view(self):
         try:
             coronal_index = self.main_window.coronal_scrollbar.value()
-            coronal_slice = get_slice(self.main_window.image, coronal_index, orientation='coronal')
-            processed_slice = self.apply_processing(coronal_slice)
-            qimage = create_qimage_from_slice(processed_slice, target_size=(400, 400))
-            self.main_window.coronal_view.display_image(qimage)
+            self.main_window.coronal_view.set_pixmap(self.slice_pixmap('coronal', coronal_index))
 
             # Always restore ROI if it exists and intersects current slice
-            if self.roi_rect_3d and self.roi_intersects_coronal_slice(coronal_index):
+            if self.roi_intersects_slice('coronal', coronal_index):
                 self.propagate_roi_to_single_view('coronal')
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to update coronal view: {str(e)}")
@@ -660,13 +863,10 @@ class MainWindowFunctions:
     def update_sagittal_view(self):
         try:
             sagittal_index = self.main_window.sagittal_scrollbar.value()
-            sagittal_slice = get_slice(self.main_window.image, sagittal_index, orientation='sagittal')
-            processed_slice = self.apply_processing(sagittal_slice)
-            qimage = create_qimage_from_slice(processed_slice, target_size=(400, 400))
-            self.main_window.sagittal_view.display_image(qimage)
+            self.main_window.sagittal_view.set_pixmap(self.slice_pixmap('sagittal', sagittal_index))
 
             # Always restore ROI if it exists and intersects current slice
-            if self.roi_rect_3d and self.roi_intersects_sagittal_slice(sagittal_index):
+            if self.roi_intersects_slice('sagittal', sagittal_index):
                 self.propagate_roi_to_single_view('sagittal')
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to update sagittal view: {str(e)}")
@@ -674,71 +874,46 @@ class MainWindowFunctions:
     def update_axial_view(self):
         try:
             axial_index = self.main_window.axial_scrollbar.value()
-            axial_slice = get_slice(self.main_window.image, axial_index, orientation='axial')
-            processed_slice = self.apply_processing(axial_slice)
-            qimage = create_qimage_from_slice(processed_slice, target_size=(400, 400))
-            self.main_window.axial_view.display_image(qimage)
+            self.main_window.axial_view.set_pixmap(self.slice_pixmap('axial', axial_index))
 
             # Always restore ROI if it exists and intersects current slice
-            if self.roi_rect_3d and self.roi_intersects_axial_slice(axial_index):
+            if self.roi_intersects_slice('axial', axial_index):
                 self.propagate_roi_to_single_view('axial')
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to update axial view: {str(e)}")
 
-    def roi_intersects_coronal_slice(self, slice_index):
-        """Check if ROI intersects with the current coronal slice"""
-        if not self.roi_rect_3d:
-            return False
-        y_min = self.roi_rect_3d.get('y_min', 0)
-        y_max = self.roi_rect_3d.get('y_max', 0)
-        return y_min <= slice_index <= y_max
-
-    def roi_intersects_sagittal_slice(self, slice_index):
-        """Check if ROI intersects with the current sagittal slice"""
-        if not self.roi_rect_3d:
-            return False
-        x_min = self.roi_rect_3d.get('x_min', 0)
-        x_max = self.roi_rect_3d.get('x_max', 0)
-        return x_min <= slice_index <= x_max
-
-    def roi_intersects_axial_slice(self, slice_index):
-        """Check if ROI intersects with the current axial slice"""
-        if not self.roi_rect_3d:
+    def roi_intersects_slice(self, orientation, slice_index):
+        """Check if the ROI intersects the given slice of a view"""
+        bounds = self._roi_bounds
+        if bounds is None:
             return False
-        z_min = self.roi_rect_3d.get('z_min', 0)
-        z_max = self.roi_rect_3d.get('z_max', 0)
-        return z_min <= slice_index <= z_max
+        # _roi_bounds is (x_min, x_max, y_min, y_max, z_min, z_max)
+        low = 2 * SCROLL_AXIS[orientation]
+        return bounds[low] <= slice_index <= bounds[low + 1]
 
     def apply_processing(self, image):
         """Apply the SAME processing pipeline used for 2D slices - this is what 3D should use too"""
         try:
             if isinstance(image, sitk.Image):
                 image_array = sitk.GetArrayFromImage(image)
+                owns_array = True  # Private copy, safe to modify
             else:
-                image_array = image.copy()
+                image_array = image
+                owns_array = False
 
-            print(f"Apply processing - Original range: {image_array.min()} to {image_array.max()}")
-
-            # Apply windowing FIRST if user has applied it
+            # Windowing first, then threshold, then contrast - each only if the user applied it
+            window = threshold_val = contrast_val = None
             if self.main_window.windowing_applied:
-                min_val, max_val = self.main_window.windowing_tool.get_values()
-                print(f"Applying windowing: {min_val} to {max_val}")
-                image_array = apply_windowing(image_array, min_val, max_val)
-                print(f"After windowing: {image_array.min()} to {image_array.max()}")
-
-            # Apply threshold AFTER windowing if user has applied it
+                window = self.main_window.windowing_tool.get_window()
+                logger.debug("Applying windowing: %s to %s", window[0], window[1])
             if self.main_window.threshold_applied:
                 threshold_val = self.main_window.threshold_slider.value()
-                print(f"Applying threshold: {threshold_val}")
-                image_array = (image_array > threshold_val) * image_array
-                print(f"After threshold: {image_array.min()} to {image_array.max()}")
-
-            # Apply contrast adjustment last if user has applied it
+                logger.debug("Applying threshold: %s", threshold_val)
             if self.main_window.contrast_applied:
                 contrast_val = self.main_window.contrast_slider.value()
-                print(f"Applying contrast: {contrast_val}")
-                image_array = adjust_contrast(image_array, contrast_val)
-                print(f"After contrast: {image_array.min()} to {image_array.max()}")
+                logger.debug("Applying contrast: %s", contrast_val)
+
+            image_array = apply_pipeline(image_array, window, threshold_val, contrast_val, inplace=owns_array)
 
             if isinstance(image, sitk.Image):
                 return sitk.GetImageFromArray(image_array)
@@ -757,89 +932,208 @@ class MainWindowFunctions:
         except (RuntimeError, AttributeError):
             return False
 
-    def build_3d_view(self):
-        """Build 3D view using the EXACT SAME processing pipeline as 2D views"""
+    def mesh_cache_key(self, kind, shape):
+        """Key for a cached isosurface: processing settings, ROI box and sampled shape"""
+        return (kind, self.pipeline_key(), self._roi_bounds, shape)
+
+    def mesh_cache_entry(self, key):
+        """Return the (possibly still empty) mesh dict for key, keeping the four most recent"""
+        entry = self._mesh_cache.get(key)
+        if entry is None:
+            entry = {}
+            self._mesh_cache[key] = entry
+            if len(self._mesh_cache) > 4:  # Two builds, each with its small preview
+                self._mesh_cache.popitem(last=False)
+        else:
+            self._mesh_cache.move_to_end(key)
+        return entry
+
+    def build_3d_view(self, preview=None):
+        """Build 3D view using the EXACT SAME processing pipeline as 2D views
+
+        preview=True builds from a volume of at most PREVIEW_MAX_DIM voxels per axis and then
+        refines to the full build; None does that only when the full build is not cached yet.
+        """
         try:
-            # Import at function level to ensure availability
-            from PyQt5.QtWidgets import QApplication, QVBoxLayout
-            from PyQt5.QtCore import QTimer
-
-            print("\n=== BUILDING 3D VIEW ===")
-            print(
-                f"Applied states: Threshold={self.main_window.threshold_applied}, Windowing={self.main_window.windowing_applied}, Contrast={self.main_window.contrast_applied}")
-
-            # Invalidate the cache
-            self.cached_downsampled_array = None
-            self.cached_3d_vertices = None
-            self.cached_3d_faces = None
+            logger.debug("=== BUILDING 3D VIEW ===")
+            logger.debug("Applied states: Threshold=%s, Windowing=%s, Contrast=%s", self.main_window.threshold_applied,
+                         self.main_window.windowing_applied, self.main_window.contrast_applied)
+
+            if self.build_3d_worker is not None:
+                # The running build finishes first; the latest settings are built right after it
+                logger.info("3D build already running - rebuilding with the latest settings when it finishes")
+                self._rebuild_3d_pending = True
+                return
 
-            # Get the original image array
-            original_image_array = sitk.GetArrayFromImage(self.main_window.image)
-            print(
-                f"Original image array - Shape: {original_image_array.shape}, Range: {original_image_array.min()} to {original_image_array.max()}")
+            image_array = self.image_array()  # Drops cached meshes if the image was replaced
+
+            # Downsample the raw volume once per image; processing then runs on the averaged voxels
+            downsample_factors = self.downsample_factors(image_array.shape)
+            if preview is not False:
+                preview_factors = self.downsample_factors(image_array.shape, PREVIEW_MAX_DIM)
+                if preview_factors == downsample_factors:
+                    preview = False  # Small volume: the full build is already quick
+                elif preview is None:
+                    shape = tuple(-(-dim // f) for dim, f in zip(image_array.shape, downsample_factors))
+                    preview = 'processed' not in self._mesh_cache.get(self.mesh_cache_key('3d', shape), {})
+                if preview:
+                    logger.debug("Showing a coarse preview before the full 3D build")
+                    downsample_factors = preview_factors
+            shape = tuple(-(-dim // f) for dim, f in zip(image_array.shape, downsample_factors))
+            logger.debug("Downsampled image array - Shape: %s, Factors: %s", shape, downsample_factors)
 
             # CRITICAL FIX: Check if ANY processing is applied
             any_processing_applied = (self.main_window.threshold_applied or
                                       self.main_window.windowing_applied or
                                       self.main_window.contrast_applied)
 
+            # Processed arrays and meshes are shared by every build with the same settings and ROI
+            mesh_entry = self.mesh_cache_entry(self.mesh_cache_key('3d', shape))
+            if 'processed' in mesh_entry:
+                logger.debug("Reusing processed 3D arrays for unchanged settings")
+                self._show_3d_view(mesh_entry, any_processing_applied)
+                if preview:
+                    QTimer.singleShot(0, lambda: self.build_3d_view(preview=False))
+                return
+
+            roi_slices = None
+            if self.roi_rect_3d:
+                roi_slices = self.get_roi_slices(image_array.shape)
+                if roi_slices is not None:
+                    roi_slices = self.downsample_roi_slices(roi_slices, downsample_factors)
+
             if any_processing_applied:
                 # Use the SAME processing pipeline as 2D views
-                print("Processing applied - using same pipeline as 2D views")
-                processed_array = self.apply_processing(original_image_array)
-                print(
-                    f"Processed array for 3D - Shape: {processed_array.shape}, Range: {processed_array.min()} to {processed_array.max()}")
+                logger.debug("Processing applied - using same pipeline as 2D views")
             else:
                 # NO processing applied - use raw data
-                print("NO processing applied - using raw data for 3D")
-                processed_array = original_image_array.copy()
-                print(
-                    f"Raw array for 3D - Shape: {processed_array.shape}, Range: {processed_array.min()} to {processed_array.max()}")
+                logger.debug("NO processing applied - using raw data for 3D")
+
+            # Downsampling and processing run off the GUI thread; only the Mayavi work comes back to it.
+            # Everything the worker needs is captured here, so it never touches a widget or a cache
+            volume = self._downsample_cache.get((id(self.main_window.image), downsample_factors))
+            worker = TaskWorker(self._prepare_3d_arrays, image_array, volume, downsample_factors,
+                                roi_slices, self.pipeline_key())
+            worker.source_image = self.main_window.image
+            worker.downsample_factors = downsample_factors
+            worker.mesh_entry = mesh_entry
+            worker.any_processing_applied = any_processing_applied
+            worker.preview = preview
+            worker.signals.finished.connect(self._on_3d_arrays_prepared)
+            worker.signals.failed.connect(self._on_3d_arrays_failed)
+            self.build_3d_worker = worker
+            QThreadPool.globalInstance().start(worker)
 
-            # Keep a copy of the original for density mapping (HU values)
-            original_for_density = original_image_array.copy()
+        except Exception as e:
+            logger.exception("Failed to build 3D view: %s", e)
+            QMessageBox.critical(self.main_window, "Error", f"Failed to build 3D view: {str(e)}")
 
-            # Apply ROI mask if ROI is selected
-            if self.roi_rect_3d:
-                roi_mask = self.get_roi_mask(processed_array)
-                if roi_mask is not None:
-                    processed_array = processed_array * roi_mask
-                    original_for_density = original_for_density * roi_mask
-                    print("Applied ROI mask to 3D rendering")
-
-            self.cached_processed_array = processed_array
-
-            # For better performance, downsample if the array is very large
-            max_dim = 256  # Maximum dimension for 3D rendering
-            original_shape = processed_array.shape
-
-            if max(original_shape) > max_dim:
-                downsample_factors = [max(1, dim // max_dim) for dim in original_shape]
-                print(f"Downsampling from {original_shape} with factors {downsample_factors}")
-                downsampled_array = processed_array[::downsample_factors[0], ::downsample_factors[1],
-                                    ::downsample_factors[2]]
-                downsampled_original = original_for_density[::downsample_factors[0], ::downsample_factors[1],
-                                       ::downsample_factors[2]]
+    def _prepare_3d_arrays(self, image_array, volume, downsample_factors, roi_slices, pipeline):
+        """Worker-thread half of build_3d_view: the downsampled, processed float32 arrays for the widget
+
+        volume is the cached downsampled volume, or None to compute it here; it is returned as
+        arrays['volume'] for the GUI thread to cache.
+        """
+        if volume is None:
+            volume = self.downsample_volume(image_array, downsample_factors)
+        original_image_array = volume
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Downsampled range: %s to %s", original_image_array.min(), original_image_array.max())
+        any_processing_applied = pipeline != (None, None, None)
+
+        # The cached volume is read-only and already serves as the original for density mapping (HU values)
+        original_for_density = original_image_array
+
+        if roi_slices is not None:
+            # Only the ROI box is processed; everything outside it is zero
+            processed_array = self.process_within_roi(original_image_array, roi_slices,
+                                                      any_processing_applied, pipeline)
+            if any_processing_applied:
+                # Converting while copying saves the float32 pass below
+                original_for_density = self.keep_roi_only(original_for_density, roi_slices,
+                                                          dtype=np.float32)
             else:
-                downsampled_array = processed_array
-                downsampled_original = original_for_density
+                original_for_density = processed_array  # Same masked raw values
+            logger.debug("Applied ROI mask to 3D rendering")
+        elif any_processing_applied:
+            processed_array = apply_pipeline(original_image_array, *pipeline)
+        else:
+            # Raw data is only read from here on, so the cached volume is used directly
+            processed_array = original_image_array
+        if processed_array is None:
+            raise ValueError("Processing the 3D volume failed")
+
+        # Only windowing/contrast (uint8) still need converting to the widget's float32;
+        # the widget branches pass these through as-is
+        same_array = original_for_density is processed_array
+        processed_array = np.ascontiguousarray(processed_array, dtype=np.float32)
+        original_for_density = (processed_array if same_array else
+                                np.ascontiguousarray(original_for_density, dtype=np.float32))
+        processed_array.flags.writeable = False
+        original_for_density.flags.writeable = False
+        # The one full pass over the volume; the range is shared with the widget through the mesh entry
+        arrays = dict(processed=processed_array, original=original_for_density,
+                      data_range=(processed_array.min(), processed_array.max()),
+                      nonzero=np.count_nonzero(processed_array), volume=volume)
+        if roi_slices is not None:
+            # The widget only extracts the isosurface from the ROI box and its one-voxel zero border
+            arrays['roi_box'] = self.pad_roi_slices(roi_slices, processed_array.shape)
+        return arrays
+
+    def _on_3d_arrays_prepared(self, arrays):
+        worker = self.build_3d_worker
+        self.build_3d_worker = None
+        if worker is None:
+            return
+        if worker.source_image is not self.main_window.image:
+            logger.warning("Image changed while preparing the 3D view; discarding the result.")
+            self._rebuild_3d_pending = False
+            return
+
+        # The downsampled volume only depends on the image, so builds with other settings reuse it
+        self.cache_downsampled_volume(worker.source_image, worker.downsample_factors,
+                                      arrays.pop('volume'))
+        # Cached under the settings the worker ran with, even if they have moved on since
+        worker.mesh_entry.update(arrays)
+        if self._rebuild_3d_pending:
+            self._rebuild_3d_pending = False
+            self.build_3d_view()
+            return
+        self._show_3d_view(worker.mesh_entry, worker.any_processing_applied)
+        if worker.preview:
+            # Refine once the preview has been drawn
+            QTimer.singleShot(0, lambda: self.build_3d_view(preview=False))
+
+    def _on_3d_arrays_failed(self, message):
+        self.build_3d_worker = None
+        self._rebuild_3d_pending = False
+        logger.error("Failed to build 3D view: %s", message)
+        QMessageBox.critical(self.main_window, "Error", f"Failed to build 3D view: {message}")
+
+    def _show_3d_view(self, mesh_entry, any_processing_applied):
+        """GUI-thread half of build_3d_view: hand the prepared arrays to the Mayavi widget"""
+        try:
+            # Import at function level to ensure availability
+            from PyQt5.QtWidgets import QVBoxLayout
+            from PyQt5.QtCore import QTimer
 
-            self.cached_downsampled_array = downsampled_array
-            print(
-                f"Final array for 3D - Shape: {downsampled_array.shape}, Range: {downsampled_array.min()} to {downsampled_array.max()}")
+            downsampled_array = mesh_entry['processed']
+            downsampled_original = mesh_entry['original']
+            data_min, data_max = mesh_entry['data_range']
+            logger.debug("Final array for 3D - Shape: %s, Range: %s to %s",
+                         downsampled_array.shape, data_min, data_max)
 
             # CRITICAL: Check data validity differently based on processing
             if any_processing_applied:
                 # For processed data, check if we have non-zero values
-                non_zero_count = np.count_nonzero(downsampled_array)
+                non_zero_count = mesh_entry['nonzero']
                 if non_zero_count == 0:
                     raise ValueError("All data was removed by processing - try adjusting threshold/windowing values")
-                print(f"Processed data: {non_zero_count} out of {downsampled_array.size} non-zero voxels")
+                logger.debug("Processed data: %s out of %s non-zero voxels", non_zero_count, downsampled_array.size)
             else:
                 # For raw data, check if we have variation
-                if downsampled_array.max() <= downsampled_array.min():
+                if data_max <= data_min:
                     raise ValueError("No variation in raw data - cannot create 3D visualization")
-                print(f"Raw data: Range {downsampled_array.min()} to {downsampled_array.max()}")
 
             # Ensure the empty_view has a layout
             if self.main_window.empty_view.layout() is None:
@@ -856,7 +1150,7 @@ class MainWindowFunctions:
             widget_needs_creation = (self.mayavi_widget is None or not self.is_widget_valid(self.mayavi_widget))
 
             if widget_needs_creation:
-                print("Creating new MayaviQWidget with processed data")
+                logger.debug("Creating new MayaviQWidget with processed data")
 
                 try:
                     # CRITICAL: Pass the processed data to the widget
@@ -864,8 +1158,9 @@ class MainWindowFunctions:
 
                     # Set original data for density mapping
                     if hasattr(self.mayavi_widget, 'visualization') and self.mayavi_widget.visualization:
-                        self.mayavi_widget.visualization.original_data = downsampled_original.astype(np.float32)
-                        print("Set original data for density mapping")
+                        self.mayavi_widget.visualization.mesh_cache_entry = mesh_entry
+                        self.mayavi_widget.visualization.original_data = downsampled_original
+                        logger.debug("Set original data for density mapping")
 
                     # Add to layout
                     layout.addWidget(self.mayavi_widget)
@@ -874,18 +1169,13 @@ class MainWindowFunctions:
                     self.mayavi_widget.show()
                     self.main_window.empty_view.update()
 
-                    # Process events
-                    QApplication.processEvents()
-
-                    # Apply colorbar fix after widget creation
+                    # Apply colorbar fix once the widget is first shown
                     self.apply_colorbar_fix_to_widget(self.mayavi_widget)
 
-                    print("MayaviQWidget created successfully with processed data")
+                    logger.debug("MayaviQWidget created successfully with processed data")
 
                 except Exception as widget_error:
-                    print(f"Error creating MayaviQWidget: {widget_error}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error creating MayaviQWidget: %s", widget_error)
 
                     # Fallback - try simple creation
                     try:
@@ -897,34 +1187,35 @@ class MainWindowFunctions:
                             try:
                                 if (hasattr(self.mayavi_widget, 'visualization') and
                                         self.mayavi_widget.visualization):
-                                    print("Setting processed data with delay")
-                                    self.mayavi_widget.visualization.data = downsampled_array.astype(np.float32)
-                                    self.mayavi_widget.visualization.original_data = downsampled_original.astype(
-                                        np.float32)
+                                    logger.debug("Setting processed data with delay")
+                                    self.mayavi_widget.visualization.mesh_cache_entry = mesh_entry
+                                    self.mayavi_widget.visualization.data = downsampled_array
+                                    self.mayavi_widget.visualization.original_data = downsampled_original
                                     self.mayavi_widget.visualization.update_scene()
 
                                     # Apply colorbar fix after data is set
                                     self.apply_colorbar_fix_to_widget(self.mayavi_widget)
-                                    print("Delayed data setting successful")
+                                    logger.debug("Delayed data setting successful")
                             except Exception as e:
-                                print(f"Error setting data: {e}")
+                                logger.error("Error setting data: %s", e)
 
                         QTimer.singleShot(500, set_data_delayed)
-                        print("Fallback widget creation successful")
+                        logger.debug("Fallback widget creation successful")
 
                     except Exception as fallback_error:
-                        print(f"Fallback creation also failed: {fallback_error}")
+                        logger.error("Fallback creation also failed: %s", fallback_error)
                         raise
 
             else:
-                print("Updating existing MayaviQWidget with new processed data")
+                logger.debug("Updating existing MayaviQWidget with new processed data")
 
                 try:
                     if (hasattr(self.mayavi_widget, 'visualization') and
                             self.mayavi_widget.visualization):
-                        print("Updating visualization with processed data")
-                        self.mayavi_widget.visualization.data = downsampled_array.astype(np.float32)
-                        self.mayavi_widget.visualization.original_data = downsampled_original.astype(np.float32)
+                        logger.debug("Updating visualization with processed data")
+                        self.mayavi_widget.visualization.mesh_cache_entry = mesh_entry
+                        self.mayavi_widget.visualization.data = downsampled_array
+                        self.mayavi_widget.visualization.original_data = downsampled_original
                         self.mayavi_widget.visualization.update_scene()
 
                         # Apply colorbar fix after update
@@ -935,7 +1226,7 @@ class MainWindowFunctions:
                         layout.addWidget(self.mayavi_widget)
 
                 except Exception as update_error:
-                    print(f"Error updating existing widget: {update_error}")
+                    logger.error("Error updating existing widget: %s", update_error)
                     # Force recreation
                     self.mayavi_widget = None
                     QTimer.singleShot(100, self.build_3d_view)
@@ -951,11 +1242,10 @@ class MainWindowFunctions:
             # Display density statistics with delay
             QTimer.singleShot(1000, self.display_density_statistics)
 
-            print("=== 3D VIEW BUILD COMPLETED ===\n")
+            logger.debug("=== 3D VIEW BUILD COMPLETED ===")
 
         except Exception as e:
-            print(f"Failed to build 3D view: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Failed to build 3D view: %s", e)
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.critical(self.main_window, "Error", f"Failed to build 3D view: {str(e)}")
 
@@ -965,15 +1255,10 @@ class MainWindowFunctions:
             if self.mayavi_widget and self.mayavi_widget.visualization:
                 stats = self.mayavi_widget.visualization.get_density_statistics()
                 if stats:
-                    stats_text = (f"Density Statistics:\n"
-                                  f"Min: {stats['min']:.1f}\n"
-                                  f"Max: {stats['max']:.1f}\n"
-                                  f"Mean: {stats['mean']:.1f}\n"
-                                  f"Median: {stats['median']:.1f}\n"
-                                  f"Std Dev: {stats['std']:.1f}")
-                    print(stats_text)
+                    logger.info("Density Statistics:\nMin: %.1f\nMax: %.1f\nMean: %.1f\nMedian: %.1f\nStd Dev: %.1f",
+                                stats['min'], stats['max'], stats['mean'], stats['median'], stats['std'])
         except Exception as e:
-            print(f"Failed to display density statistics: {str(e)}")
+            logger.error("Failed to display density statistics: %s", e)
 
     def popout_3d_view(self):
         try:
@@ -1002,8 +1287,7 @@ class MainWindowFunctions:
             self.apply_colorbar_fix_to_widget(mayavi_widget)
 
         except Exception as e:
-            print(f"Failed to pop out 3D view: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Failed to pop out 3D view: %s", e)
             QMessageBox.critical(self.main_window, "Error", f"Failed to pop out 3D view: {str(e)}")
 
     def close_mayavi_window(self, event):
@@ -1020,8 +1304,7 @@ class MainWindowFunctions:
             self.mayavi_window = None
             event.accept()
         except Exception as e:
-            print(f"Failed to close Mayavi window: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Failed to close Mayavi window: %s", e)
             event.accept()
 
     def update_threshold_label(self):
@@ -1032,7 +1315,7 @@ class MainWindowFunctions:
 
     def apply_threshold(self):
         try:
-            print(f"Applying threshold: {self.main_window.threshold_slider.value()}")
+            logger.debug("Applying threshold: %s", self.main_window.threshold_slider.value())
             self.main_window.threshold_applied = True
             self.update_views()
         except Exception as e:
@@ -1046,7 +1329,7 @@ class MainWindowFunctions:
 
     def apply_contrast(self):
         try:
-            print(f"Applying contrast: {self.main_window.contrast_slider.value()}")
+            logger.debug("Applying contrast: %s", self.main_window.contrast_slider.value())
             self.main_window.contrast_applied = True
             self.update_views()
         except Exception as e:
@@ -1061,7 +1344,7 @@ class MainWindowFunctions:
             min_val, max_val = self.main_window.windowing_tool.get_values()
             center, width = self.main_window.windowing_tool.get_center_width()
 
-            print(f"Windowing applied: Center={center}, Width={width}, Range={min_val} to {max_val}")
+            logger.debug("Windowing applied: Center=%s, Width=%s, Range=%s to %s", center, width, min_val, max_val)
 
             # Update all views immediately to show the windowing effect
             self.update_views()
@@ -1071,22 +1354,52 @@ class MainWindowFunctions:
 
     def apply_filter(self):
         try:
+            if self.filter_worker is not None:
+                return  # A filter is already running
             filter_method = self.main_window.filtering_combobox.currentText()
             filter_value = int(self.main_window.filter_value_combobox.currentText())
             if filter_method == "Gaussian Filter":
-                self.filtered_image = apply_gaussian_filter(self.main_window.image, sigma=filter_value)
+                worker = TaskWorker(apply_gaussian_filter, self.main_window.image, filter_value)
             elif filter_method == "Median Filter":
-                self.filtered_image = apply_median_filter(self.main_window.image, size=filter_value)
+                worker = TaskWorker(apply_median_filter, self.main_window.image, filter_value)
+            else:
+                return
+
+            # Filter off the GUI thread; the result comes back through a queued signal
+            worker.source_image = self.main_window.image
+            worker.signals.finished.connect(self._on_filter_finished)
+            worker.signals.failed.connect(self._on_filter_failed)
+            self.filter_worker = worker
+            self.main_window.apply_filter_button.setEnabled(False)
+            QThreadPool.globalInstance().start(worker)
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Error", f"Failed to apply filter: {str(e)}")
 
+    def _on_filter_finished(self, filtered_image):
+        try:
+            worker = self.filter_worker
+            self.filter_worker = None
+            self.main_window.apply_filter_button.setEnabled(True)
+            if worker is None or worker.source_image is not self.main_window.image:
+                logger.warning("Image changed while filtering; discarding the filtered result.")
+                return
+
+            self.filtered_image = filtered_image
             if self.filtered_image is not None:
-                print("Filter applied. Updating image.")
+                logger.info("Filter applied. Updating image.")
                 self.main_window.image = self.filtered_image  # Update the image with the filtered image
+                self._np_image = None
                 self.update_views()
             else:
-                print("Filtered image is None.")
+                logger.warning("Filtered image is None.")
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to apply filter: {str(e)}")
 
+    def _on_filter_failed(self, message):
+        self.filter_worker = None
+        self.main_window.apply_filter_button.setEnabled(True)
+        QMessageBox.critical(self.main_window, "Error", f"Failed to apply filter: {message}")
+
     def update_filter_value(self):
         try:
             if self.main_window.filtering_combobox.currentText() == "Gaussian Filter":
@@ -1098,80 +1411,33 @@ class MainWindowFunctions:
 
     def export_3d_to_stl(self):
         try:
-            print("\n=== EXPORTING 3D TO STL ===")
-            print(
-                f"Applied states: Threshold={self.main_window.threshold_applied}, Windowing={self.main_window.windowing_applied}, Contrast={self.main_window.contrast_applied}")
-
-            # Get the image array
-            image_array = sitk.GetArrayFromImage(self.main_window.image)
+            logger.debug("=== EXPORTING 3D TO STL ===")
+            logger.debug("Applied states: Threshold=%s, Windowing=%s, Contrast=%s", self.main_window.threshold_applied,
+                         self.main_window.windowing_applied, self.main_window.contrast_applied)
 
             # CRITICAL FIX: Check if ANY processing is applied (same as build_3d_view)
             any_processing_applied = (self.main_window.threshold_applied or
                                       self.main_window.windowing_applied or
                                       self.main_window.contrast_applied)
 
-            if any_processing_applied:
-                # Apply the SAME processing to the image array as used for 3D
-                print("Processing applied - using same pipeline as 2D/3D views")
-                processed_array = self.apply_processing(image_array)
+            # Reuse the mesh of an earlier export with the same settings and ROI
+            mesh_entry = self.mesh_cache_entry(self.mesh_cache_key('stl', self.image_array().shape))
+            if 'vertices' in mesh_entry:
+                logger.debug("STL Export - Reusing cached mesh")
             else:
-                # NO processing applied - use raw data
-                print("NO processing applied - using raw data for STL export")
-                processed_array = image_array.copy()
-
-            print(f"STL Export - Array range: {processed_array.min()} to {processed_array.max()}")
-
-            # Apply ROI mask if ROI is selected
-            if self.roi_rect_3d:
-                roi_mask = self.get_roi_mask(processed_array)
-                if roi_mask is not None:
-                    processed_array = processed_array * roi_mask
-                    print("Applied ROI mask to STL export")
-
-            # Downsample the image data for faster 3D rendering
-            downsample_factor = 1  # Adjust this factor to control the level of downsampling
-            downsampled_array = processed_array[::downsample_factor, ::downsample_factor, ::downsample_factor]
-
-            # Determine appropriate iso-surface level based on data
-            data_min = downsampled_array.min()
-            data_max = downsampled_array.max()
-
-            if any_processing_applied:
-                # For processed data, use a low iso-level to capture processed structures
-                non_zero_count = np.count_nonzero(downsampled_array)
-                if non_zero_count > 0:
-                    non_zero_data = downsampled_array[downsampled_array > data_min]
-                    iso_level = np.percentile(non_zero_data, 10)  # Low percentile for processed data
-                else:
-                    raise ValueError("No data remaining after processing for STL export")
-            else:
-                # For raw data, use higher percentile
-                if data_max > 1000:  # Likely HU values
-                    iso_level = 200  # Bone threshold in HU
-                    if iso_level > data_max:
-                        iso_level = np.percentile(downsampled_array[downsampled_array > 0], 75)
-                else:  # Other data
-                    iso_level = np.percentile(downsampled_array[downsampled_array > 0], 60)
-
-            # Ensure iso_level is valid
-            iso_level = max(data_min + 0.001, min(iso_level, data_max - 0.001))
-            print(f"STL Export - Using iso-surface level: {iso_level}")
-
-            # Create the 3D mesh from the downsampled array
-            vertices, faces, _, _ = measure.marching_cubes(downsampled_array, level=iso_level)
+                vertices, faces = self._compute_stl_mesh(any_processing_applied)
+                mesh_entry.update(vertices=vertices, faces=faces)
+            vertices, faces = mesh_entry['vertices'], mesh_entry['faces']
 
             # Retrieve the spacing information from the image metadata
             spacing = get_image_metadata(self.main_window.image)  # Correct function call
             scale_factors = spacing[::-1]  # Reverse to match the order of axes in vertices
 
-            # Apply the scaling factors to the vertices
-            vertices = vertices * scale_factors
-
-            # Create the mesh
-            exported_mesh = mesh.Mesh(np.zeros(faces.shape[0], dtype=mesh.Mesh.dtype))
-            for i, face in enumerate(faces):
-                for j in range(3):
-                    exported_mesh.vectors[i][j] = vertices[face[j], :]
+            # Create the mesh, gathering every triangle's corners from the indexed vertices at once
+            # and scaling them in place; normals are computed when the file is saved
+            exported_mesh = mesh.Mesh(np.zeros(faces.shape[0], dtype=mesh.Mesh.dtype), calculate_normals=False)
+            exported_mesh.vectors[:] = vertices[faces]
+            exported_mesh.vectors *= scale_factors
 
             # Show the file dialog to save the STL file
             options = QFileDialog.Options()
@@ -1188,27 +1454,99 @@ class MainWindowFunctions:
                     success_msg += " (raw data)"
                 QMessageBox.information(self.main_window, "Success", success_msg)
 
-            print("=== STL EXPORT COMPLETED ===\n")
+            logger.debug("=== STL EXPORT COMPLETED ===")
 
         except Exception as e:
             QMessageBox.critical(self.main_window, "Error", f"Failed to export 3D model: {str(e)}")
 
+    def _compute_stl_mesh(self, any_processing_applied):
+        """Process the full-resolution volume and run marching cubes for STL export"""
+        # Work on the ROI box plus a one-voxel border instead of the whole volume. The border is
+        # zeroed below, which closes the surface exactly like zeroing everything outside the ROI.
+        image_array = self.image_array()
+        roi_slices = self.get_roi_slices(image_array.shape) if self.roi_rect_3d else None
+        if roi_slices is not None:
+            box = self.pad_roi_slices(roi_slices, image_array.shape)
+            image_array = image_array[box]
+            inner = tuple(slice(s.start - b.start, s.stop - b.start) for s, b in zip(roi_slices, box))
+            offset = np.array([b.start for b in box], dtype=np.float32)
+        else:
+            offset = None
+
+        if any_processing_applied:
+            # Apply the SAME processing to the image array as used for 3D
+            logger.debug("Processing applied - using same pipeline as 2D/3D views")
+        else:
+            # NO processing applied - use raw data
+            logger.debug("NO processing applied - using raw data for STL export")
+
+        if roi_slices is not None:
+            # Only the ROI is processed; the border around it stays zero
+            processed_array = self.process_within_roi(image_array, inner, any_processing_applied)
+            logger.debug("Applied ROI mask to STL export")
+        elif any_processing_applied:
+            processed_array = self.apply_processing(image_array)
+        else:
+            # Marching cubes only reads the array, so the zero-copy image view is enough
+            processed_array = image_array
+
+        # Downsample the image data for faster 3D rendering
+        downsample_factor = 1  # Adjust this factor to control the level of downsampling
+        downsampled_array = processed_array[::downsample_factor, ::downsample_factor, ::downsample_factor]
+
+        # Determine appropriate iso-surface level based on data
+        data_min = downsampled_array.min()
+        data_max = downsampled_array.max()
+        logger.debug("STL Export - Array range: %s to %s", data_min, data_max)
+
+        if any_processing_applied:
+            # For processed data, use a low iso-level to capture processed structures
+            non_zero_count = np.count_nonzero(downsampled_array)
+            if non_zero_count > 0:
+                # Low percentile for processed data
+                iso_level = sampled_percentile(downsampled_array, 10, above=data_min)
+            else:
+                raise ValueError("No data remaining after processing for STL export")
+        else:
+            # For raw data, use higher percentile
+            if data_max > 1000:  # Likely HU values
+                iso_level = 200  # Bone threshold in HU
+                if iso_level > data_max:
+                    iso_level = sampled_percentile(downsampled_array, 75, above=0)
+            else:  # Other data
+                iso_level = sampled_percentile(downsampled_array, 60, above=0)
+
+        # Ensure iso_level is valid
+        iso_level = max(data_min + 0.001, min(iso_level, data_max - 0.001))
+        logger.debug("STL Export - Using iso-surface level: %s", iso_level)
+
+        # Create the 3D mesh from the downsampled array
+        vertices, faces, _, _ = extract_isosurface(downsampled_array, iso_level)
+        if offset is not None:
+            vertices += offset  # Back to full-volume voxel coordinates
+        return vertices, faces
+
     def numpy_to_vtk_image(self, numpy_array):
+        """Wrap a (z, y, x) array as uint8 vtkImageData without copying it into VTK
+
+        The image shares memory with a C-contiguous uint8 version of numpy_array (the array
+        itself when it already is one), which is kept alive on the returned image; do not
+        modify that array while the image is in use.
+        """
         try:
             # Convert numpy array to VTK image data
             vtk_image = vtk.vtkImageData()
             depth, height, width = numpy_array.shape
-
             vtk_image.SetDimensions(width, height, depth)
-            vtk_image.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 1)
 
-            # Get a pointer to the VTK image data
-            vtk_array = vtk.util.numpy_support.numpy_to_vtk(numpy_array.ravel(), deep=True,
+            # Only copies when the input is strided or not uint8; VTK then points at this buffer
+            array = np.ascontiguousarray(numpy_array, dtype=np.uint8)
+            vtk_array = vtk.util.numpy_support.numpy_to_vtk(array.reshape(-1), deep=False,
                                                             array_type=vtk.VTK_UNSIGNED_CHAR)
             vtk_image.GetPointData().SetScalars(vtk_array)
+            vtk_image.numpy_source = array  # Keeps the shared buffer alive as long as the image
 
             return vtk_image
         except Exception as e:
-            print(f"Failed to convert numpy array to VTK image: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Failed to convert numpy array to VTK image: %s", e)
             return None
\ No newline at end of file
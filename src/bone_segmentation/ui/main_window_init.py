@@ -56,15 +56,15 @@ class MainWindow(QMainWindow):
             self.empty_view.setFixedSize(400, 450)  # Increased height for controls
 
             self.coronal_scrollbar = QScrollBar(Qt.Vertical)
-            self.coronal_scrollbar.valueChanged.connect(self.functions.update_coronal_view)
+            self.coronal_scrollbar.valueChanged.connect(lambda _: self.functions.schedule_view_update('coronal'))
             self.coronal_scrollbar.setEnabled(False)
 
             self.sagittal_scrollbar = QScrollBar(Qt.Vertical)
-            self.sagittal_scrollbar.valueChanged.connect(self.functions.update_sagittal_view)
+            self.sagittal_scrollbar.valueChanged.connect(lambda _: self.functions.schedule_view_update('sagittal'))
             self.sagittal_scrollbar.setEnabled(False)
 
             self.axial_scrollbar = QScrollBar(Qt.Vertical)
-            self.axial_scrollbar.valueChanged.connect(self.functions.update_axial_view)
+            self.axial_scrollbar.valueChanged.connect(lambda _: self.functions.schedule_view_update('axial'))
             self.axial_scrollbar.setEnabled(False)
 
             self.loadFolderButton = QPushButton("Import CT|MRI Dataset")
@@ -138,7 +138,7 @@ class MainWindow(QMainWindow):
             self.build_3d_button = QPushButton("Build 3D")
             self.build_3d_button.setFixedSize(130, 40)
             self.build_3d_button.setEnabled(False)
-            self.build_3d_button.clicked.connect(self.functions.build_3d_view)
+            self.build_3d_button.clicked.connect(lambda: self.functions.build_3d_view())
 
             # Pop out 3D view button
             self.popout_3d_button = QPushButton("Pop Out 3D")
@@ -1,13 +1,112 @@
 # windowing_tool.py - Simplified without automatic real-time preview
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSlider, QLabel, QHBoxLayout, QSizePolicy, QFrame, QComboBox
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QCursor
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QSlider, QLabel, QHBoxLayout, QFrame, QComboBox, QToolButton
+from PyQt5.QtCore import Qt, QTimer, QSignalBlocker
+from PyQt5.QtGui import QFont, QFontMetrics
+
+
+# Stylesheet for the preset ComboBox; a module constant so it is built once, not per tool
+_COMBO_STYLE = """
+QComboBox {
+    background-color: white;
+    border: 1px solid #cccccc;
+    border-radius: 3px;
+    padding: 3px 18px 3px 6px;
+    font-size: 8pt;
+    font-family: Arial;
+    color: black;
+    selection-background-color: #0078d4;
+}
+
+QComboBox:hover {
+    border: 1px solid #0078d4;
+}
+
+QComboBox:focus {
+    border: 2px solid #0078d4;
+}
+
+QComboBox::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: top right;
+    width: 15px;
+    border-left-width: 1px;
+    border-left-color: #cccccc;
+    border-left-style: solid;
+    border-top-right-radius: 3px;
+    border-bottom-right-radius: 3px;
+    background-color: #f0f0f0;
+}
+
+QComboBox::down-arrow {
+    image: none;
+    border-left: 4px solid transparent;
+    border-right: 4px solid transparent;
+    border-top: 6px solid #666666;
+    width: 0px;
+    height: 0px;
+}
+
+QComboBox QAbstractItemView {
+    background-color: white;
+    border: 1px solid #cccccc;
+    selection-background-color: #0078d4;
+    selection-color: white;
+    font-size: 8pt;
+    font-family: Arial;
+    color: black;
+    padding: 2px;
+    min-width: 120px;
+}
+
+QComboBox QAbstractItemView::item {
+    background-color: white;
+    color: black;
+    padding: 4px 8px;
+    border: none;
+    min-height: 18px;
+}
+
+QComboBox QAbstractItemView::item:selected {
+    background-color: #0078d4;
+    color: white;
+}
+
+QComboBox QAbstractItemView::item:hover {
+    background-color: #e6f3ff;
+    color: black;
+}
+"""
+
+
+class _DerivedSlider:
+    """Read-only stand-in for the old min/max sliders, derived from center and width"""
+    __slots__ = ('_value',)
+
+    def __init__(self, value):
+        self._value = value
+
+    def value(self):
+        return self._value()
 
 
 class WindowingTool(QWidget):
     # NO automatic windowing_changed signal - user must click Apply
 
+    # Standard window presets for medical imaging as name -> (center, width), shared by all instances
+    WINDOW_PRESETS = MappingProxyType({
+        "Bone": (1000, 1800),
+        "Soft Tissue": (40, 400),
+        "Lung": (-600, 1600),
+        "Brain": (40, 80),
+        "Liver": (60, 160),
+        "Mediastinum": (50, 350),
+        "Custom": (40, 400),
+    })
+
     def __init__(self, parent=None):
         try:
             super().__init__(parent)
@@ -15,18 +114,15 @@ class WindowingTool(QWidget):
             self.min_hu = -1024  # Air
             self.max_hu = 3071  # Dense bone
 
-            # Standard window presets for medical imaging
-            self.window_presets = {
-                "Bone": {"center": 1000, "width": 1800},
-                "Soft Tissue": {"center": 40, "width": 400},
-                "Lung": {"center": -600, "width": 1600},
-                "Brain": {"center": 40, "width": 80},
-                "Liver": {"center": 60, "width": 160},
-                "Mediastinum": {"center": 50, "width": 350},
-                "Custom": {"center": 40, "width": 400}
-            }
-
             self.current_preset = "Bone"
+            # Window tuple read by every view, rebuilt only when the settings change
+            self._window = (100, 1900)
+            self._label_center_width = None
+            # Presets read from the current series' DICOM header, name -> (center, width)
+            self._series_presets = {}
+            # Legacy min/max slider interface for compatibility, created once
+            self.min_slider = _DerivedSlider(lambda: self.get_values()[0])
+            self.max_slider = _DerivedSlider(lambda: self.get_values()[1])
             self.initUI()
             self.apply_preset("Bone")
         except Exception as e:
@@ -34,6 +130,12 @@ class WindowingTool(QWidget):
 
     def initUI(self):
         try:
+            # Slider drags fire valueChanged on every step; the label follows at most every 30 ms
+            self._update_timer = QTimer(self)
+            self._update_timer.setSingleShot(True)
+            self._update_timer.setInterval(30)
+            self._update_timer.timeout.connect(self.on_sliders_changed)
+
             layout = QVBoxLayout()
             layout.setSpacing(10)  # Add more spacing between elements
             layout.setContentsMargins(10, 10, 10, 10)  # Add margins around the layout
@@ -47,7 +149,7 @@ class WindowingTool(QWidget):
             preset_label.setMinimumHeight(25)  # Ensure adequate height
 
             self.preset_combo = QComboBox()
-            self.preset_combo.addItems(list(self.window_presets.keys()))
+            self.preset_combo.addItems(list(self.WINDOW_PRESETS))
             self.preset_combo.setCurrentText(self.current_preset)
             self.preset_combo.currentTextChanged.connect(self.on_preset_changed)
 
@@ -55,84 +157,28 @@ class WindowingTool(QWidget):
             self.preset_combo.setFont(QFont('Arial', 8))  # Back to 8pt
             self.preset_combo.setMinimumHeight(28)  # Increased height
             self.preset_combo.setMinimumWidth(120)
+            # Size from the minimum contents length, not by measuring every item on changes
+            self.preset_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+            self._fit_preset_popup()
+
+            self.preset_combo.setStyleSheet(_COMBO_STYLE)
+
+            # VOI function: linear ramp, or the DICOM sigmoid for a softer roll-off at the window edges
+            function_label = QLabel("Function:")
+            function_label.setFont(QFont('Arial', 8))
+            function_label.setMinimumHeight(25)
 
-            # Set comprehensive stylesheet for the ComboBox
-            combo_style = """
-                QComboBox {
-                    background-color: white;
-                    border: 1px solid #cccccc;
-                    border-radius: 3px;
-                    padding: 3px 18px 3px 6px;
-                    font-size: 8pt;
-                    font-family: Arial;
-                    color: black;
-                    selection-background-color: #0078d4;
-                }
-
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-
-                QComboBox:focus {
-                    border: 2px solid #0078d4;
-                }
-
-                QComboBox::drop-down {
-                    subcontrol-origin: padding;
-                    subcontrol-position: top right;
-                    width: 15px;
-                    border-left-width: 1px;
-                    border-left-color: #cccccc;
-                    border-left-style: solid;
-                    border-top-right-radius: 3px;
-                    border-bottom-right-radius: 3px;
-                    background-color: #f0f0f0;
-                }
-
-                QComboBox::down-arrow {
-                    image: none;
-                    border-left: 4px solid transparent;
-                    border-right: 4px solid transparent;
-                    border-top: 6px solid #666666;
-                    width: 0px;
-                    height: 0px;
-                }
-
-                QComboBox QAbstractItemView {
-                    background-color: white;
-                    border: 1px solid #cccccc;
-                    selection-background-color: #0078d4;
-                    selection-color: white;
-                    font-size: 8pt;
-                    font-family: Arial;
-                    color: black;
-                    padding: 2px;
-                    min-width: 120px;
-                }
-
-                QComboBox QAbstractItemView::item {
-                    background-color: white;
-                    color: black;
-                    padding: 4px 8px;
-                    border: none;
-                    min-height: 18px;
-                }
-
-                QComboBox QAbstractItemView::item:selected {
-                    background-color: #0078d4;
-                    color: white;
-                }
-
-                QComboBox QAbstractItemView::item:hover {
-                    background-color: #e6f3ff;
-                    color: black;
-                }
-            """
-
-            self.preset_combo.setStyleSheet(combo_style)
+            self.function_combo = QComboBox()
+            self.function_combo.addItems(["Linear", "Sigmoid"])
+            self.function_combo.setFont(QFont('Arial', 8))
+            self.function_combo.setMinimumHeight(28)
+            self.function_combo.setStyleSheet(_COMBO_STYLE)
+            self.function_combo.currentTextChanged.connect(lambda _: self.update_windowing_display())
 
             preset_layout.addWidget(preset_label)
             preset_layout.addWidget(self.preset_combo)
+            preset_layout.addWidget(function_label)
+            preset_layout.addWidget(self.function_combo)
             layout.addLayout(preset_layout)
 
             # Add spacing after preset selection
@@ -143,6 +189,7 @@ class WindowingTool(QWidget):
             self.label.setFont(QFont('Arial', 8))  # Back to 8pt
             self.label.setAlignment(Qt.AlignCenter)
             self.label.setMinimumHeight(25)  # Ensure adequate height
+            self.label.setTextFormat(Qt.PlainText)  # Skip the rich-text check on every update
             layout.addWidget(self.label)
 
             # Status label - shows that user needs to click Apply
@@ -162,29 +209,21 @@ class WindowingTool(QWidget):
             center_title.setFixedWidth(45)  # Slightly wider
             center_title.setMinimumHeight(25)  # Ensure adequate height
 
-            self.center_label_left = QLabel("-")
-            self.center_label_left.setFont(QFont('Arial', 14))
-            self.center_label_left.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.center_label_left.setCursor(QCursor(Qt.PointingHandCursor))
-            self.center_label_left.mousePressEvent = self.decrease_center
+            self.center_decrease_button = self._nudge_button("-", self.decrease_center)
 
             self.center_slider = QSlider(Qt.Horizontal)
             self.center_slider.setMinimum(self.min_hu)
             self.center_slider.setMaximum(self.max_hu)
             self.center_slider.setValue(1000)  # Default bone center
-            self.center_slider.valueChanged.connect(self.update_windowing_display)
+            self.center_slider.valueChanged.connect(lambda _: self._update_timer.start())
             self.center_slider.setMaximumWidth(200)  # Restrict slider width
 
-            self.center_label_right = QLabel("+")
-            self.center_label_right.setFont(QFont('Arial', 13))
-            self.center_label_right.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.center_label_right.setCursor(QCursor(Qt.PointingHandCursor))
-            self.center_label_right.mousePressEvent = self.increase_center
+            self.center_increase_button = self._nudge_button("+", self.increase_center)
 
             center_layout.addWidget(center_title)
-            center_layout.addWidget(self.center_label_left)
+            center_layout.addWidget(self.center_decrease_button)
             center_layout.addWidget(self.center_slider)
-            center_layout.addWidget(self.center_label_right)
+            center_layout.addWidget(self.center_increase_button)
 
             # Window Width slider
             width_layout = QHBoxLayout()
@@ -195,29 +234,21 @@ class WindowingTool(QWidget):
             width_title.setFixedWidth(45)  # Slightly wider
             width_title.setMinimumHeight(25)  # Ensure adequate height
 
-            self.width_label_left = QLabel("-")
-            self.width_label_left.setFont(QFont('Arial', 14))
-            self.width_label_left.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.width_label_left.setCursor(QCursor(Qt.PointingHandCursor))
-            self.width_label_left.mousePressEvent = self.decrease_width
+            self.width_decrease_button = self._nudge_button("-", self.decrease_width)
 
             self.width_slider = QSlider(Qt.Horizontal)
             self.width_slider.setMinimum(1)  # Minimum width of 1
             self.width_slider.setMaximum(4000)  # Maximum practical width
             self.width_slider.setValue(1800)  # Default bone width
-            self.width_slider.valueChanged.connect(self.update_windowing_display)
+            self.width_slider.valueChanged.connect(lambda _: self._update_timer.start())
             self.width_slider.setMaximumWidth(200)  # Restrict slider width
 
-            self.width_label_right = QLabel("+")
-            self.width_label_right.setFont(QFont('Arial', 13))
-            self.width_label_right.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            self.width_label_right.setCursor(QCursor(Qt.PointingHandCursor))
-            self.width_label_right.mousePressEvent = self.increase_width
+            self.width_increase_button = self._nudge_button("+", self.increase_width)
 
             width_layout.addWidget(width_title)
-            width_layout.addWidget(self.width_label_left)
+            width_layout.addWidget(self.width_decrease_button)
             width_layout.addWidget(self.width_slider)
-            width_layout.addWidget(self.width_label_right)
+            width_layout.addWidget(self.width_increase_button)
 
             layout.addLayout(center_layout)
             layout.addLayout(width_layout)
@@ -227,6 +258,19 @@ class WindowingTool(QWidget):
         except Exception as e:
             print(f"Failed to initialize UI: {str(e)}")
 
+    def _nudge_button(self, text, slot):
+        """-/+ button that keeps stepping its slider while held down"""
+        button = QToolButton()
+        button.setText(text)
+        button.setFont(QFont('Arial', 13))
+        button.setAutoRepeat(True)
+        button.setAutoRepeatDelay(250)
+        button.setAutoRepeatInterval(30)
+        button.setFixedSize(22, 22)
+        button.setCursor(Qt.PointingHandCursor)
+        button.clicked.connect(slot)
+        return button
+
     def on_preset_changed(self, preset_name):
         """Handle preset selection change"""
         try:
@@ -236,28 +280,60 @@ class WindowingTool(QWidget):
         except Exception as e:
             print(f"Failed to change preset: {str(e)}")
 
+    def _fit_preset_popup(self):
+        # Give the dropdown list a fixed width for the current names, measured once here
+        metrics = QFontMetrics(QFont('Arial', 8))
+        names = list(self.WINDOW_PRESETS) + list(self._series_presets)
+        self.preset_combo.view().setMinimumWidth(max(metrics.horizontalAdvance(name) for name in names) + 40)
+
+    @contextmanager
+    def _frozen_updates(self):
+        # Hold repaints of the whole tool until the block ends, then paint once
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+
     def apply_preset(self, preset_name):
         """Apply a windowing preset"""
         try:
-            if preset_name in self.window_presets:
-                preset = self.window_presets[preset_name]
-
-                # Block signals to prevent recursive updates
-                self.center_slider.blockSignals(True)
-                self.width_slider.blockSignals(True)
-
-                self.center_slider.setValue(preset["center"])
-                self.width_slider.setValue(preset["width"])
-
-                # Unblock signals and update
-                self.center_slider.blockSignals(False)
-                self.width_slider.blockSignals(False)
-
-                self.update_windowing_display()
-                print(f"Applied {preset_name} preset: Center={preset['center']}, Width={preset['width']}")
+            preset = self._series_presets.get(preset_name) or self.WINDOW_PRESETS.get(preset_name)
+            if preset is not None:
+                center, width = preset
+
+                # One update: no slider signals, a single repaint, and no pending drag to undo it
+                self._update_timer.stop()
+                with QSignalBlocker(self.center_slider), QSignalBlocker(self.width_slider), self._frozen_updates():
+                    self.center_slider.setValue(center)
+                    self.width_slider.setValue(width)
+                    self.update_windowing_display()
+                print(f"Applied {preset_name} preset: Center={center}, Width={width}")
         except Exception as e:
             print(f"Failed to apply preset: {str(e)}")
 
+    def set_series_presets(self, presets):
+        """Replace the DICOM header presets, given as ((name, center, width), ...), listed before Custom"""
+        try:
+            with QSignalBlocker(self.preset_combo):
+                for name in self._series_presets:
+                    self.preset_combo.removeItem(self.preset_combo.findText(name))
+
+                self._series_presets = {}
+                for name, center, width in presets:
+                    if name in self.WINDOW_PRESETS or name in self._series_presets:
+                        name = f"{name} (DICOM)"
+                    self._series_presets[name] = (center, width)
+                    self.preset_combo.insertItem(self.preset_combo.findText("Custom"), name)
+
+                # A removed series preset leaves its window on the sliders as a custom one
+                if self.preset_combo.currentText() != self.current_preset:
+                    self.preset_combo.setCurrentText("Custom")
+                    self.current_preset = "Custom"
+            self._fit_preset_popup()
+        except Exception as e:
+            print(f"Failed to set series presets: {str(e)}")
+
     def update_windowing_display(self):
         """Update windowing display ONLY - no automatic application"""
         try:
@@ -268,22 +344,32 @@ class WindowingTool(QWidget):
             min_val = center - width // 2
             max_val = center + width // 2
 
-            # Update label
-            self.label.setText(f"Window: C:{center} W:{width} (Range: {min_val} to {max_val})")
+            function = self.get_function()
+            self._window = (min_val, max_val) if function == 'linear' else (min_val, max_val, function)
 
-            # If user manually adjusts sliders, switch to Custom preset
-            if self.sender() in [self.center_slider, self.width_slider]:
-                if self.current_preset != "Custom":
-                    self.preset_combo.blockSignals(True)
-                    self.preset_combo.setCurrentText("Custom")
-                    self.preset_combo.blockSignals(False)
-                    self.current_preset = "Custom"
+            # Update label, unless a drag ended where it started or only the function changed
+            if (center, width) != self._label_center_width:
+                self._label_center_width = (center, width)
+                self.label.setText(f"Window: C:{center} W:{width} (Range: {min_val} to {max_val})")
 
             # NO automatic signal emission - user must click Apply
 
         except Exception as e:
             print(f"Failed to update windowing display: {str(e)}")
 
+    def on_sliders_changed(self):
+        """Debounced slider handler: refresh the label and switch to the Custom preset"""
+        try:
+            self.update_windowing_display()
+
+            # Presets set the sliders with signals blocked, so this only runs for manual adjustments
+            if self.current_preset != "Custom":
+                with QSignalBlocker(self.preset_combo):
+                    self.preset_combo.setCurrentText("Custom")
+                self.current_preset = "Custom"
+        except Exception as e:
+            print(f"Failed to handle slider change: {str(e)}")
+
     def get_values(self):
         """Get current min and max values"""
         try:
@@ -296,6 +382,21 @@ class WindowingTool(QWidget):
             print(f"Failed to get windowing values: {str(e)}")
             return 100, 1900  # Default fallback
 
+    def get_function(self):
+        """Get the selected windowing function, 'linear' or 'sigmoid'"""
+        return self.function_combo.currentText().lower()
+
+    def get_window(self):
+        """Get the window as passed to apply_pipeline: (min, max), plus the function when not linear
+
+        All views share the tuple stored by update_windowing_display rather than re-reading the sliders.
+        """
+        if self._update_timer.isActive():
+            # A slider moved within the debounce interval; settle it now
+            self._update_timer.stop()
+            self.on_sliders_changed()
+        return self._window
+
     def get_center_width(self):
         """Get current center and width values"""
         try:
@@ -305,20 +406,20 @@ class WindowingTool(QWidget):
             return 1000, 1800  # Default fallback
 
     # Center adjustment methods
-    def decrease_center(self, event):
+    def decrease_center(self):
         try:
             self.center_slider.setValue(self.center_slider.value() - 10)
         except Exception as e:
             print(f"Failed to decrease center: {str(e)}")
 
-    def increase_center(self, event):
+    def increase_center(self):
         try:
             self.center_slider.setValue(self.center_slider.value() + 10)
         except Exception as e:
             print(f"Failed to increase center: {str(e)}")
 
     # Width adjustment methods
-    def decrease_width(self, event):
+    def decrease_width(self):
         try:
             current_width = self.width_slider.value()
             new_width = max(1, current_width - 10)  # Ensure minimum width of 1
@@ -326,39 +427,8 @@ class WindowingTool(QWidget):
         except Exception as e:
             print(f"Failed to decrease width: {str(e)}")
 
-    def increase_width(self, event):
+    def increase_width(self):
         try:
             self.width_slider.setValue(self.width_slider.value() + 10)
         except Exception as e:
             print(f"Failed to increase width: {str(e)}")
-
-    # Legacy methods for compatibility
-    @property
-    def min_slider(self):
-        """Legacy property for compatibility"""
-
-        class MockSlider:
-            def value(self):
-                center = self.parent.center_slider.value()
-                width = self.parent.width_slider.value()
-                return center - width // 2
-
-            def __init__(self, parent):
-                self.parent = parent
-
-        return MockSlider(self)
-
-    @property
-    def max_slider(self):
-        """Legacy property for compatibility"""
-
-        class MockSlider:
-            def value(self):
-                center = self.parent.center_slider.value()
-                width = self.parent.width_slider.value()
-                return center + width // 2
-
-            def __init__(self, parent):
-                self.parent = parent
-
-        return MockSlider(self)
\ No newline at end of file
@@ -1,7 +1,9 @@
 # mayavi_widget.py - Fixed to use processed data correctly
+from functools import lru_cache
 from mayavi import mlab
 from pyface.qt import QtGui
 from mayavi.core.ui.api import MayaviScene, MlabSceneModel, SceneEditor
+from mayavi.core.lut_manager import pylab_luts
 from traits.api import HasTraits, Instance, Array
 from traitsui.api import View, Item
 from tvtk.pyface.scene_editor import SceneEditor
@@ -10,13 +12,49 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 import numpy as np
 from tvtk.api import tvtk
-from skimage import measure
+
+from bone_segmentation.core.image_processing import extract_isosurface, sampled_percentile
+
+# Slightly off-white with a faint blue tint, like real bone
+WHITE_BONE_RGB = (248, 248, 255)
+
+# Fixed medical CT display range (HU) and resolution of precomputed density LUTs
+MEDICAL_HU_RANGE = (-100, 2000)
+DENSITY_LUT_SIZE = 1024
+
+
+@lru_cache(maxsize=32)
+def _build_colormap_lut(name, n=256):
+    """Build a read-only (n, 4) uint8 RGBA table for a colormap, cached per (name, n).
+
+    'white_bone' is the uniform bone color; any other name is resampled from the
+    256-entry table Mayavi itself uses for that lut_mode. Returns None if Mayavi
+    has no such colormap. Callers must copy the table before modifying it.
+    """
+    if name == 'white_bone':
+        table = np.empty((n, 4), dtype=np.uint8)
+        table[:, :3] = WHITE_BONE_RGB
+        table[:, 3] = 255
+    else:
+        control = pylab_luts.get(name)
+        if control is None:
+            return None
+        # Linear interpolation between Mayavi's entries, one RGBA channel at a time
+        positions = np.linspace(0.0, len(control) - 1, n)
+        entries = np.arange(len(control))
+        rgba = np.column_stack([np.interp(positions, entries, channel) for channel in control.T])
+        table = np.rint(rgba * 255).astype(np.uint8)
+
+    table.setflags(write=False)
+    return table
 
 
 class MayaviQWidget(QWidget):
     def __init__(self, parent=None, data=None):
         try:
             QWidget.__init__(self, parent)
+            self._first_show_callbacks = []
+            self._shown = False
 
             # Create visualization first
             self.visualization = Visualization(data=data)
@@ -60,6 +98,22 @@ class MayaviQWidget(QWidget):
             layout.addWidget(QLabel("3D Visualization Error"))
             layout.addWidget(self.ui)
 
+    def call_on_first_show(self, callback):
+        """Run callback once the widget has been shown, deferring heavy scene work until then"""
+        if getattr(self, '_shown', False):
+            QTimer.singleShot(0, callback)
+        else:
+            self._first_show_callbacks.append(callback)
+
+    def showEvent(self, event):
+        QWidget.showEvent(self, event)
+        if not getattr(self, '_shown', True):
+            self._shown = True
+            callbacks, self._first_show_callbacks = self._first_show_callbacks, []
+            for callback in callbacks:
+                # Let the scene finish its own first render before running the callbacks
+                QTimer.singleShot(0, callback)
+
     def create_control_panel(self):
         """Create control panel for visualization options"""
         try:
@@ -173,16 +227,23 @@ class Visualization(HasTraits):
 
     def __init__(self, data=None, **traits):
         super(Visualization, self).__init__(**traits)
-        self.data = data.astype(np.float32) if data is not None else np.zeros((0, 0, 0), dtype=np.float32)
+        self.data = np.asarray(data, dtype=np.float32) if data is not None else np.zeros((0, 0, 0), dtype=np.float32)
         self.current_surface = None
         self.current_colorbar = None
         self.picker_callback = None
         self.parent_widget = None
         self.mesh_data = None
+        # Optional dict shared with the caller's mesh cache: filled after marching
+        # cubes, and reused instead of re-running it when already populated
+        self.mesh_cache_entry = None
         self.original_data = None
         self.scalar_bar_widget = None
         self.colorbar_pending = False
         self.interactor_ready = False
+        # Last colorbar visibility applied by toggle_colorbar (None = unknown, must apply)
+        self._colorbar_visible = None
+        # Reusable RGBA table for uniform colormaps (256 entries is the VTK default)
+        self._lut_scratch = np.empty((256, 4), dtype=np.uint8)
 
         if self.data.size > 0:
             self.original_data = self.data.copy()
@@ -232,51 +293,72 @@ class Visualization(HasTraits):
                 return
 
             print(f"Building 3D visualization with data shape: {self.data.shape}")
-            print(f"Data range: {self.data.min()} to {self.data.max()}")
 
             # FIXED: Don't automatically apply bone thresholding
             # Use the data as provided - it should already be processed
 
-            # Check if we have meaningful data variation
-            data_min = self.data.min()
-            data_max = self.data.max()
+            # Check if we have meaningful data variation; the caller's cache entry may already know the range
+            entry = self.mesh_cache_entry
+            if entry and 'data_range' in entry:
+                data_min, data_max = entry['data_range']
+            else:
+                data_min = self.data.min()
+                data_max = self.data.max()
+            print(f"Data range: {data_min} to {data_max}")
 
             if data_max <= data_min:
                 print("No variation in data - cannot create 3D surface")
                 return
 
-            # Check if data appears to be already thresholded (lots of zeros)
-            non_zero_count = np.count_nonzero(self.data)
-            total_count = self.data.size
-            zero_percentage = (total_count - non_zero_count) / total_count * 100
+            reuse_mesh = bool(entry) and 'vertices' in entry
+            if reuse_mesh:
+                iso_level = entry['iso_level']
+                print(f"Reusing cached mesh at iso-level {iso_level}")
+            else:
+                # Check if data appears to be already thresholded (lots of zeros)
+                if entry and 'nonzero' in entry:
+                    non_zero_count = entry['nonzero']
+                else:
+                    non_zero_count = np.count_nonzero(self.data)
+                total_count = self.data.size
+                zero_percentage = (total_count - non_zero_count) / total_count * 100
 
-            print(
-                f"Data analysis: {non_zero_count}/{total_count} non-zero voxels ({100 - zero_percentage:.1f}% non-zero)")
+                print(
+                    f"Data analysis: {non_zero_count}/{total_count} non-zero voxels ({100 - zero_percentage:.1f}% non-zero)")
 
-            if zero_percentage > 50:
-                # Data appears to be already processed/thresholded
-                # Use a low iso-level to capture the processed data
-                iso_level = data_min + (data_max - data_min) * 0.01  # Very low threshold
-                print(f"Using low iso-level for processed data: {iso_level}")
-            else:
-                # Data appears to be raw - use median as iso-level
-                iso_level = np.median(self.data[self.data > data_min])
-                print(f"Using median iso-level for raw data: {iso_level}")
+                if zero_percentage > 50:
+                    # Data appears to be already processed/thresholded
+                    # Use a low iso-level to capture the processed data
+                    iso_level = data_min + (data_max - data_min) * 0.01  # Very low threshold
+                    print(f"Using low iso-level for processed data: {iso_level}")
+                else:
+                    # Data appears to be raw - use median as iso-level
+                    iso_level = sampled_percentile(self.data, 50, above=data_min)
+                    print(f"Using median iso-level for raw data: {iso_level}")
 
-            # Ensure iso_level is valid
-            iso_level = max(data_min + 0.001, min(iso_level, data_max - 0.001))
-            print(f"Final iso-surface level: {iso_level}")
+                # Ensure iso_level is valid
+                iso_level = max(data_min + 0.001, min(iso_level, data_max - 0.001))
+                print(f"Final iso-surface level: {iso_level}")
 
             # Store iso_level for later use
             self.current_iso_level = iso_level
 
             # Generate mesh using marching cubes
             try:
-                vertices, faces, normals, values = measure.marching_cubes(
-                    self.data,
-                    level=iso_level,
-                    step_size=1
-                )
+                if reuse_mesh:
+                    vertices, faces = entry['vertices'], entry['faces']
+                    normals, values = entry['normals'], entry['values']
+                else:
+                    box = entry.get('roi_box') if entry else None
+                    if box is not None:
+                        # Everything outside the ROI is zero, so its padded box holds the whole surface
+                        vertices, faces, normals, values = extract_isosurface(self.data[box], iso_level)
+                        vertices += np.array([s.start for s in box], dtype=vertices.dtype)
+                    else:
+                        vertices, faces, normals, values = extract_isosurface(self.data, iso_level)
+                    if entry is not None:
+                        entry.update(vertices=vertices, faces=faces, normals=normals, values=values,
+                                     iso_level=iso_level)
                 print(f"Generated mesh: {len(vertices)} vertices, {len(faces)} faces")
 
                 # Store mesh data for picking
@@ -321,6 +403,7 @@ class Visualization(HasTraits):
                     else:
                         # Apply the selected standard colormap
                         lut_manager.lut_mode = selected_colormap
+                        self.apply_precomputed_lut(lut_manager, selected_colormap)
                         # Set up appropriate range for the surface
                         self.setup_surface_lut_range(mesh, density_values, iso_level)
 
@@ -338,6 +421,7 @@ class Visualization(HasTraits):
                 # Store references with fixed medical range
                 self.current_surface = mesh
                 self.current_colorbar = lut_manager
+                self._colorbar_visible = None
                 self.current_density_range = (-100, 2000)  # Fixed medical CT range
 
                 # Set up interactive picking
@@ -674,13 +758,22 @@ class Visualization(HasTraits):
         """Fallback volume rendering if marching cubes fails"""
         try:
             print("Creating volume rendering as fallback")
-            vol = mlab.pipeline.volume(
-                mlab.pipeline.scalar_field(self.data, figure=self.scene.mayavi_scene),
-                figure=self.scene.mayavi_scene
-            )
-            vol.lut_manager.lut_mode = 'bone'
-            self.current_surface = vol
-            self.current_colorbar = vol.lut_manager
+            # Suppress the intermediate renders of each pipeline stage and render once at the end
+            render_was_disabled = self.scene.disable_render
+            self.scene.disable_render = True
+            try:
+                vol = mlab.pipeline.volume(
+                    mlab.pipeline.scalar_field(self.data, figure=self.scene.mayavi_scene),
+                    figure=self.scene.mayavi_scene
+                )
+                vol.lut_manager.lut_mode = 'bone'
+                self.current_surface = vol
+                self.current_colorbar = vol.lut_manager
+                self._colorbar_visible = None
+            finally:
+                self.scene.disable_render = render_was_disabled
+            if not render_was_disabled:
+                self.scene.mayavi_scene.render()
         except Exception as e:
             print(f"Volume rendering also failed: {e}")
 
@@ -694,6 +787,7 @@ class Visualization(HasTraits):
             # Method 1: Standard approach
             try:
                 lut_manager.show_scalar_bar = True
+                self._colorbar_visible = None
 
                 if hasattr(lut_manager, 'scalar_bar'):
                     sb = lut_manager.scalar_bar
@@ -779,7 +873,8 @@ class Visualization(HasTraits):
                 print("No actor found in picker")
                 return
 
-            picked_point = np.array(picker_obj.pick_position)
+            px, py, pz = picker_obj.pick_position
+            picked_point = (px, py, pz)
             print(f"Raw picked point: {picked_point}")
 
             if self.data is None or self.data.size == 0:
@@ -788,15 +883,15 @@ class Visualization(HasTraits):
 
             max_z, max_y, max_x = self.data.shape
 
-            x_idx = int(np.clip(round(picked_point[0]), 0, max_x - 1))
-            y_idx = int(np.clip(round(picked_point[1]), 0, max_y - 1))
-            z_idx = int(np.clip(round(picked_point[2]), 0, max_z - 1))
+            x_idx = min(max(int(round(px)), 0), max_x - 1)
+            y_idx = min(max(int(round(py)), 0), max_y - 1)
+            z_idx = min(max(int(round(pz)), 0), max_z - 1)
 
-            # Use original data for density if available
+            # Use original data for density if available (.item() returns a plain Python scalar)
             if self.original_data is not None:
-                density_value = float(self.original_data[z_idx, y_idx, x_idx])
+                density_value = self.original_data.item(z_idx, y_idx, x_idx)
             else:
-                density_value = float(self.data[z_idx, y_idx, x_idx])
+                density_value = self.data.item(z_idx, y_idx, x_idx)
 
             print(f"Density value at picked location: {density_value}")
 
@@ -811,12 +906,13 @@ class Visualization(HasTraits):
             traceback.print_exc()
 
     def add_pick_marker(self, position, density_value):
-        """Add a visual marker at the picked position"""
+        """Add a visual marker at the picked (x, y, z) position"""
         try:
             print(f"Adding marker at position: {position} with density: {density_value}")
 
+            px, py, pz = position
             marker = mlab.points3d(
-                [position[0]], [position[1]], [position[2]],
+                [px], [py], [pz],
                 [1],
                 scale_factor=5.0,
                 color=(1, 0, 0),
@@ -824,9 +920,8 @@ class Visualization(HasTraits):
                 mode='sphere'
             )
 
-            text_pos = position + np.array([2, 2, 2])
             text_label = mlab.text3d(
-                text_pos[0], text_pos[1], text_pos[2],
+                px + 2, py + 2, pz + 2,
                 f"{density_value:.1f}",
                 scale=3.0,
                 color=(1, 1, 0),
@@ -851,8 +946,11 @@ class Visualization(HasTraits):
                 print("No current surface available for colormap change")
                 return
 
-            # Get the LUT manager
-            lut_manager = self.current_surface.module_manager.scalar_lut_manager
+            # Resolve the Mayavi/VTK objects once; each lookup crosses the Traits layer
+            module_manager = self.current_surface.module_manager
+            lut_manager = module_manager.scalar_lut_manager
+            actor = getattr(self.current_surface, 'actor', None)
+            mapper = getattr(actor, 'mapper', None) if actor is not None else None
             old_mode = getattr(lut_manager, 'lut_mode', 'unknown')
 
             print(f"Changing from '{old_mode}' to '{colormap_name}'")
@@ -862,19 +960,19 @@ class Visualization(HasTraits):
                 self.apply_white_bone_colormap(lut_manager)
             else:
                 # CRITICAL FIX: Always restore scalar coloring when switching away from white_bone
-                if self.current_surface and hasattr(self.current_surface, 'actor'):
+                if actor is not None:
                     try:
                         # Re-enable scalar coloring for density mapping
-                        self.current_surface.actor.mapper.scalar_visibility = True
+                        mapper.scalar_visibility = True
                         print("Re-enabled scalar coloring for density mapping")
 
                         # Reset any uniform color settings
-                        self.current_surface.actor.property.color = (
-                        1.0, 1.0, 1.0)  # Reset to white, but scalar coloring will override
+                        actor.property.color = (1.0, 1.0, 1.0)  # Reset to white, but scalar coloring will override
 
                         # Restore color bar if it was hidden
                         if hasattr(lut_manager, '_original_scalar_bar_state'):
                             lut_manager.show_scalar_bar = lut_manager._original_scalar_bar_state
+                            self._colorbar_visible = None
                             delattr(lut_manager, '_original_scalar_bar_state')
                             print("Restored color bar display")
 
@@ -883,6 +981,7 @@ class Visualization(HasTraits):
 
                 # Change to standard colormap
                 lut_manager.lut_mode = colormap_name
+                self.apply_precomputed_lut(lut_manager, colormap_name)
 
                 # Clear custom colormap flags
                 if hasattr(lut_manager, '_custom_colormap_applied'):
@@ -890,18 +989,14 @@ class Visualization(HasTraits):
                 if hasattr(lut_manager, '_uniform_white'):
                     delattr(lut_manager, '_uniform_white')
 
-            # Multiple update strategies (with better error handling)
+            # Only the LUT changed - mark the LUT and mapper modified without
+            # re-pushing geometry/scalars through mlab_source or the pipeline
+            lut = getattr(lut_manager, 'lut', None)
             update_methods = [
                 lambda: self.safe_setattr(lut_manager, 'data_changed', True),
-                lambda: lut_manager.lut.modified() if hasattr(lut_manager, 'lut') else None,
-                lambda: self.safe_setattr(self.current_surface.module_manager, 'data_changed', True) if hasattr(
-                    self.current_surface, 'module_manager') else None,
-                lambda: self.current_surface.mlab_source.update() if hasattr(self.current_surface,
-                                                                             'mlab_source') else None,
-                lambda: self.current_surface.update() if hasattr(self.current_surface, 'update') else None,
-                lambda: self.current_surface.actor.mapper.modified() if hasattr(self.current_surface,
-                                                                                'actor') and hasattr(
-                    self.current_surface.actor, 'mapper') else None,
+                lambda: lut.modified() if lut is not None else None,
+                lambda: self.safe_setattr(module_manager, 'data_changed', True),
+                lambda: mapper.modified() if mapper is not None else None,
             ]
 
             successful_updates = 0
@@ -923,10 +1018,12 @@ class Visualization(HasTraits):
             render_attempts = 0
             max_attempts = 3
 
+            mayavi_scene = self.scene.mayavi_scene
+
             def attempt_render():
                 nonlocal render_attempts
                 try:
-                    self.scene.mayavi_scene.render()
+                    mayavi_scene.render()
                     render_attempts += 1
                     print(f"Render attempt {render_attempts} completed")
 
@@ -962,17 +1059,27 @@ class Visualization(HasTraits):
             # Method 1: Try to set uniform color via actor material properties
             try:
                 if self.current_surface and hasattr(self.current_surface, 'actor'):
-                    # Set the actor to use a uniform white color
-                    self.current_surface.actor.property.color = (1.0, 1.0, 1.0)  # Pure white
-
-                    # Disable scalar coloring to use uniform color
-                    self.current_surface.actor.mapper.scalar_visibility = False
+                    actor = self.current_surface.actor
 
-                    # Set material properties for realistic bone appearance
-                    self.current_surface.actor.property.ambient = 0.3  # Ambient lighting
-                    self.current_surface.actor.property.diffuse = 0.7  # Diffuse reflection
-                    self.current_surface.actor.property.specular = 0.3  # Specular highlight
-                    self.current_surface.actor.property.specular_power = 20  # Shininess
+                    # Batch the property writes into a single render
+                    render_was_disabled = self.scene.disable_render
+                    self.scene.disable_render = True
+                    try:
+                        # Set the actor to use a uniform white color
+                        actor.property.color = (1.0, 1.0, 1.0)  # Pure white
+
+                        # Disable scalar coloring to use uniform color
+                        actor.mapper.scalar_visibility = False
+
+                        # Set material properties for realistic bone appearance
+                        actor.property.ambient = 0.3  # Ambient lighting
+                        actor.property.diffuse = 0.7  # Diffuse reflection
+                        actor.property.specular = 0.3  # Specular highlight
+                        actor.property.specular_power = 20  # Shininess
+                    finally:
+                        self.scene.disable_render = render_was_disabled
+                    if not render_was_disabled:
+                        self.scene.mayavi_scene.render()
 
                     print("Applied uniform white color via actor properties")
                     return
@@ -982,20 +1089,15 @@ class Visualization(HasTraits):
 
             # Method 2: Fallback - create uniform LUT
             try:
-                # Get the LUT (lookup table)
-                lut = lut_manager.lut.table.to_array()
-
-                # Set all colors to the same white bone color
-                # Use a slightly off-white for more realistic bone appearance
-                bone_white_r = 248  # Slightly off pure white
-                bone_white_g = 248
-                bone_white_b = 255  # Very slight blue tint like real bone
+                # Reuse the preallocated table instead of copying the current LUT out of VTK
+                n_colors = lut_manager.lut.number_of_colors
+                if n_colors == len(self._lut_scratch):
+                    lut = self._lut_scratch
+                else:
+                    lut = np.empty((n_colors, 4), dtype=np.uint8)
 
-                for i in range(len(lut)):
-                    lut[i][0] = bone_white_r  # Red
-                    lut[i][1] = bone_white_g  # Green
-                    lut[i][2] = bone_white_b  # Blue
-                    lut[i][3] = 255  # Alpha (fully opaque)
+                # Set all colors to the same (cached) white bone color
+                np.copyto(lut, _build_colormap_lut('white_bone', n_colors))
 
                 # Apply the uniform lookup table
                 lut_manager.lut.table = lut
@@ -1016,6 +1118,7 @@ class Visualization(HasTraits):
                 if hasattr(lut_manager, 'show_scalar_bar'):
                     lut_manager._original_scalar_bar_state = lut_manager.show_scalar_bar
                     lut_manager.show_scalar_bar = False
+                    self._colorbar_visible = None
                     print("Hid color bar for uniform white display")
             except Exception as colorbar_error:
                 print(f"Failed to hide color bar: {colorbar_error}")
@@ -1031,6 +1134,25 @@ class Visualization(HasTraits):
             except Exception as fallback_error:
                 print(f"Fallback also failed: {fallback_error}")
 
+    def apply_precomputed_lut(self, lut_manager, colormap_name):
+        """Install a prebuilt HU->RGBA table spanning the medical CT range"""
+        try:
+            table = _build_colormap_lut(colormap_name, DENSITY_LUT_SIZE)
+            if table is None:
+                # Not one of Mayavi's table colormaps - keep its own LUT for this mode
+                return False
+
+            lut_manager.lut.number_of_colors = DENSITY_LUT_SIZE
+            lut_manager.lut.table = np.array(table)  # VTK needs a writable buffer
+            lut_manager.use_default_range = False
+            lut_manager.data_range = MEDICAL_HU_RANGE
+            print(f"Installed precomputed {DENSITY_LUT_SIZE}-entry LUT for '{colormap_name}'")
+            return True
+
+        except Exception as e:
+            print(f"Failed to install precomputed LUT: {e}")
+            return False
+
     def force_colormap_refresh(self, lut_manager):
         """Force a complete refresh when switching from bone (uniform white) to other colormaps"""
         try:
@@ -1039,6 +1161,7 @@ class Visualization(HasTraits):
             # Ensure color bar is visible
             try:
                 lut_manager.show_scalar_bar = True
+                self._colorbar_visible = None
                 print("Ensured color bar is visible")
             except Exception as cb_error:
                 print(f"Failed to show color bar: {cb_error}")
@@ -1072,6 +1195,7 @@ class Visualization(HasTraits):
         """Ensure color bar is visible in embedded view"""
         try:
             print("Ensuring color bar is visible in embedded view")
+            self._colorbar_visible = None
 
             # Multiple approaches to force color bar visibility
             methods_tried = 0
@@ -1185,6 +1309,10 @@ class Visualization(HasTraits):
     def toggle_colorbar(self, show):
         """Toggle colorbar visibility with enhanced embedded view support"""
         try:
+            # Nothing to do if the colorbar is already in the requested state
+            if self._colorbar_visible == show:
+                return
+
             print(f"Toggling colorbar: {show}")
 
             if self.current_colorbar and hasattr(self.current_colorbar, 'show_scalar_bar'):
@@ -1219,6 +1347,7 @@ class Visualization(HasTraits):
                     QTimer.singleShot(50, lambda: self.scene.mayavi_scene.render())
                     QTimer.singleShot(150, lambda: self.scene.mayavi_scene.render())
 
+                    self._colorbar_visible = show
                     print(f"Colorbar visibility set to: {show}")
                 else:
                     print("Interactor not ready, deferring colorbar toggle")
@@ -1,6 +1,9 @@
 """
 Sample test file for bone segmentation core module.
 """
+import subprocess
+import sys
+
 import pytest
 
 
@@ -22,6 +25,256 @@ class TestImageProcessing:
         from bone_segmentation.core.image_processing import get_slice
         assert callable(get_slice)
 
+    def test_get_slice_matches_array_indexing(self):
+        """Test that get_slice returns the expected plane for each orientation."""
+        import numpy as np
+        import SimpleITK as sitk
+        from bone_segmentation.core.image_processing import get_slice
+
+        array = np.arange(4 * 5 * 6, dtype=np.int16).reshape(4, 5, 6)
+        image = sitk.GetImageFromArray(array)
+
+        np.testing.assert_array_equal(get_slice(image, 2, 'axial'), array[2, :, :])
+        np.testing.assert_array_equal(get_slice(image, 3, 'coronal'), array[:, 3, :])
+        np.testing.assert_array_equal(get_slice(image, 1, 'sagittal'), array[:, :, 1])
+        # Served from the cache on the second call; callers get their own writable copy
+        slice = get_slice(image, 2, 'axial', prefetch=True)
+        np.testing.assert_array_equal(slice, array[2, :, :])
+        slice[:] = 0
+        np.testing.assert_array_equal(get_slice(image, 2, 'axial'), array[2, :, :])
+
+    def test_slice_cache_does_not_keep_volume_alive(self):
+        """Test that cached slices do not pin a volume the caller has dropped."""
+        import gc
+        import weakref
+        import numpy as np
+        import SimpleITK as sitk
+        from bone_segmentation.core.image_processing import get_slice
+
+        image = sitk.GetImageFromArray(np.zeros((4, 5, 6), dtype=np.int16))
+        get_slice(image, 2, 'axial', prefetch=False)
+        ref = weakref.ref(image)
+        del image
+        gc.collect()
+        assert ref() is None
+
+    def test_apply_windowing_inplace_option(self):
+        """Test that windowing scales to uint8 and honours inplace=False."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import apply_windowing
+
+        array = np.array([[-100.0, 0.0], [50.0, 200.0]])
+        original = array.copy()
+
+        result = apply_windowing(array, 0, 100, inplace=False)
+        np.testing.assert_array_equal(array, original)
+        assert result.dtype == np.uint8
+        np.testing.assert_array_equal(result, [[0, 0], [127, 255]])
+
+        # In-place windowing overwrites the float input with the scaled values
+        apply_windowing(array, 0, 100)
+        np.testing.assert_allclose(array, [[0.0, 0.0], [127.5, 255.0]])
+
+    def test_apply_pipeline_matches_chained_steps(self):
+        """Test that the pipeline equals the individual steps and leaves its input alone."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import (
+            apply_pipeline, apply_windowing, apply_threshold, adjust_contrast)
+
+        array = np.array([[-300, -20, 0], [90, 400, 1200]], dtype=np.int16)
+        original = array.copy()
+
+        expected = adjust_contrast(apply_threshold(apply_windowing(array, -100, 500, inplace=False), 40), 60)
+        result = apply_pipeline(array, (-100, 500), 40, 60)
+        np.testing.assert_array_equal(array, original)
+        np.testing.assert_array_equal(result, expected)
+
+        # The in-place path may reuse the caller's buffer but must give the same values
+        result = apply_pipeline(array.copy(), threshold_value=0, inplace=True)
+        np.testing.assert_array_equal(result, [[0, 0, 0], [90, 400, 1200]])
+
+    def test_apply_pipeline_lookup_table_matches_chained_steps(self):
+        """Test that large int16 arrays get the same result as running each step."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import (
+            apply_pipeline, apply_windowing, apply_threshold, adjust_contrast)
+
+        array = np.random.default_rng(0).integers(-32768, 32768, (300, 300)).astype(np.int16)
+        expected = adjust_contrast(apply_threshold(apply_windowing(array, -100, 500, inplace=False), 40), 60)
+        np.testing.assert_array_equal(apply_pipeline(array, (-100, 500), 40, 60), expected)
+
+        result = apply_pipeline(array, threshold_value=-10)
+        assert result.dtype == np.int16
+        np.testing.assert_array_equal(result, apply_threshold(array, -10))
+
+    def test_numba_pipeline_matches_numpy_at_window_edges(self):
+        """Test that the fused Numba kernels give the NumPy result on and around the window bounds."""
+        import numpy as np
+        pytest.importorskip("numba")
+        from bone_segmentation.core import _fast
+        from bone_segmentation.core.image_processing import (
+            apply_windowing, apply_threshold, adjust_contrast, contrast_factor)
+
+        values = np.arange(-2000, 4000, dtype=np.int16)
+        for low, high in ((-100, 500), (-160, 240), (100, 1900), (0, 1)):
+            expected = apply_windowing(values, low, high, inplace=False)
+            for parallel in (False, True):
+                np.testing.assert_array_equal(_fast.pipeline(values, (low, high), None, None, parallel), expected)
+
+        expected = adjust_contrast(apply_threshold(apply_windowing(values, -160, 240, inplace=False), 40), 60)
+        np.testing.assert_array_equal(_fast.pipeline(values, (-160, 240), 40, contrast_factor(60)), expected)
+
+    def test_sigmoid_windowing(self):
+        """Test that sigmoid windowing is centred and monotone, and the pipeline paths agree."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import apply_pipeline, apply_windowing
+
+        result = apply_windowing(np.array([-5000, 200, 201, 5000]), -100, 500, function='sigmoid')
+        np.testing.assert_array_equal(result, [0, 127, 127, 255])
+
+        array = np.random.default_rng(0).integers(-32768, 32768, (300, 300)).astype(np.int16)
+        expected = apply_windowing(array, -100, 500, inplace=False, function='sigmoid')
+        assert np.all(np.diff(expected.ravel()[np.argsort(array, axis=None)].astype(int)) >= 0)
+        np.testing.assert_array_equal(apply_pipeline(array, (-100, 500, 'sigmoid')), expected)
+
+    def test_block_mean_matches_strided_shape(self):
+        """Test that block averaging keeps the strided shape and averages each block."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import block_mean
+
+        array = np.arange(5 * 4 * 6, dtype=np.int16).reshape(5, 4, 6)
+        result = block_mean(array, (2, 2, 3))
+        assert result.shape == array[::2, ::2, ::3].shape
+        assert result.dtype == np.float32
+        assert result[0, 0, 0] == array[:2, :2, :3].mean()
+        # The partial block along z repeats the last plane
+        assert result[2, 1, 1] == array[4, 2:4, 3:6].mean()
+
+    def test_sampled_percentile(self):
+        """Test that small arrays give the exact percentile and large ones a close estimate."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import sampled_percentile
+
+        small = np.array([-5.0, 0.0, 1.0, 2.0, 3.0])
+        assert sampled_percentile(small, 50, above=0) == 2.0
+        assert sampled_percentile(small, 50, above=10) is None
+
+        large = np.random.default_rng(0).normal(300, 400, (128, 128, 128))
+        exact = np.percentile(large[large > 0], 60)
+        assert abs(sampled_percentile(large, 60, above=0) - exact) < 10
+
+    def test_extract_isosurface_matches_marching_cubes(self):
+        """Test that the isosurface lies where skimage puts it and uses the same winding."""
+        import numpy as np
+        from skimage import measure
+        from bone_segmentation.core.image_processing import extract_isosurface
+
+        z, y, x = np.mgrid[:20, :22, :24]
+        volume = (100 - ((z - 9) ** 2 + (y - 11) ** 2 + (x - 13) ** 2)).astype(np.float32)
+        vertices, faces, normals, _ = extract_isosurface(volume, 40.0)
+        expected, _, _, _ = measure.marching_cubes(volume, level=40.0)
+
+        radius = np.linalg.norm(vertices - [9, 11, 13], axis=1)
+        np.testing.assert_allclose(radius.mean(), np.linalg.norm(expected - [9, 11, 13], axis=1).mean(), rtol=1e-3)
+        # Like skimage, triangles are wound against the outward normals of a bright blob
+        corners = vertices[faces]
+        winding = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        assert np.mean(np.sum(winding * (corners.mean(axis=1) - [9, 11, 13]), axis=1) < 0) > 0.99
+
+    def test_create_qimage_reuses_buffer(self):
+        """Test that create_qimage_from_slice fills a matching QImage in place."""
+        import numpy as np
+        from bone_segmentation.core.image_processing import create_qimage_from_slice
+
+        # Odd width exercises the padded scanline stride
+        slice = np.arange(5 * 7, dtype=np.int16).reshape(5, 7)
+        qimage = create_qimage_from_slice(slice)
+        assert (qimage.width(), qimage.height()) == (7, 5)
+        assert qimage.pixelColor(6, 4).red() == 255
+        assert qimage.pixelColor(0, 0).red() == 0
+
+        assert create_qimage_from_slice(slice[::-1], out=qimage) is qimage
+        assert qimage.pixelColor(0, 0).red() == 210
+
+    def test_filters_match_ndimage_and_are_cached(self):
+        """Test that the filters match scipy and reuse the result for the same image."""
+        import numpy as np
+        import scipy.ndimage as ndimage
+        import SimpleITK as sitk
+        from bone_segmentation.core.image_processing import (
+            apply_gaussian_filter, apply_median_filter, prune_filter_cache)
+
+        array = np.random.default_rng(0).integers(-1000, 2000, (6, 7, 8)).astype(np.int16)
+        image = sitk.GetImageFromArray(array)
+        image.SetSpacing((0.5, 0.7, 2.0))
+
+        filtered = apply_gaussian_filter(image, 2)
+        np.testing.assert_array_equal(sitk.GetArrayFromImage(filtered), ndimage.gaussian_filter(array, 2))
+        assert filtered.GetSpacing() == image.GetSpacing()
+        assert apply_gaussian_filter(image, 2) is filtered
+        assert apply_gaussian_filter(image, 3) is not filtered
+
+        filtered = apply_median_filter(image, 3)
+        np.testing.assert_array_equal(sitk.GetArrayFromImage(filtered), ndimage.median_filter(array, 3))
+
+        # Loading another volume releases the results computed from this one
+        prune_filter_cache(sitk.GetImageFromArray(array))
+        assert apply_median_filter(image, 3) is not filtered
+
+    def test_load_image_is_cached_until_file_changes(self, tmp_path):
+        """Test that load_image reuses a loaded volume until the file is modified."""
+        import os
+        import numpy as np
+        import SimpleITK as sitk
+        from bone_segmentation.core.image_processing import load_image
+
+        path = str(tmp_path / "volume.nii.gz")
+        sitk.WriteImage(sitk.GetImageFromArray(np.zeros((4, 5, 6), dtype=np.int16)), path)
+        load_image.cache_clear()
+
+        first = load_image(path)
+        assert first is not None
+        assert load_image(path) is first
+
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        assert load_image(path) is not first
+
+    def test_read_window_presets(self, tmp_path):
+        """Test that DICOM window tags become named presets and other files give none."""
+        import numpy as np
+        import SimpleITK as sitk
+        from bone_segmentation.core.image_processing import read_window_presets
+
+        image = sitk.GetImageFromArray(np.zeros((8, 8), dtype=np.int16))
+        image.SetMetaData('0028|1050', '40\\-600.4')
+        image.SetMetaData('0028|1051', '400\\1500')
+        image.SetMetaData('0028|1055', 'SOFT')
+        path = str(tmp_path / "slice.dcm")
+        sitk.WriteImage(image, path)
+        assert read_window_presets(path) == (("SOFT", 40, 400), ("DICOM 2", -600, 1500))
+
+        path = str(tmp_path / "volume.nii.gz")
+        sitk.WriteImage(sitk.GetImageFromArray(np.zeros((4, 5, 6), dtype=np.int16)), path)
+        assert read_window_presets(path) == ()
+
+
+class TestPackageExports:
+    """Tests for the lazily resolved package-level exports."""
+
+    def test_exported_names_resolve(self):
+        """Test that every name in __all__ is available from the package."""
+        import bone_segmentation
+        for name in bone_segmentation.__all__:
+            assert getattr(bone_segmentation, name) is not None
+
+    def test_import_does_not_load_image_processing(self):
+        """Test that importing the package defers the image processing imports."""
+        code = ("import sys, bone_segmentation; "
+                "print('bone_segmentation.core.image_processing' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
 
 class TestUIModule:
     """Tests for UI module imports."""